@@ -20,42 +20,109 @@ sophisticated plasma physics models and machine learning algorithms.
 """
 
 import asyncio
+import inspect
+import itertools
 import time
-from typing import Dict, List, Optional, Callable, Any
-from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Dict, List, Optional, Callable, Any
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from enum import Enum
+from enum import IntEnum
 import logging
+from collections import deque, OrderedDict
 
-from ..llm.command_parser import CommandParser, ParsedCommand, ControlCommand
-from ..epics.controller import EPICSController, ControlResult, PVStatus
+import orjson
 
+from ..llm.command_parser import ParsedCommand, get_parser
+from ..epics.controller import EPICSController, ControlResult
 
-class ExecutionStatus(Enum):
+try:
+    import epics
+    EPICS_AVAILABLE = True
+except ImportError:
+    epics = None
+    EPICS_AVAILABLE = False
+
+if not logging.getLogger().handlers:
+    logging.basicConfig(level=logging.INFO)
+
+
+class ExecutionStatus(IntEnum):
     """Command execution status"""
-    PENDING = "pending"
-    PARSING = "parsing"
-    EXECUTING = "executing"
-    MONITORING = "monitoring"
-    COMPLETED = "completed"
-    FAILED = "failed"
-    CANCELLED = "cancelled"
+    PENDING = 0
+    PARSING = 1
+    EXECUTING = 2
+    MONITORING = 3
+    COMPLETED = 4
+    FAILED = 5
+    CANCELLED = 6
+    
+    def __str__(self) -> str:
+        """Lower-case status name used in user-facing output"""
+        return self.name.lower()
+
+
+# Statuses after which an execution no longer changes
+_TERMINAL_STATUSES = frozenset({
+    ExecutionStatus.COMPLETED,
+    ExecutionStatus.FAILED,
+    ExecutionStatus.CANCELLED
+})
+
+# Offset between the monotonic clock and wall-clock time (seconds)
+_MONOTONIC_OFFSET = time.time() - time.monotonic()
+
+
+def _monotonic_to_iso(timestamp: Optional[float]) -> Optional[str]:
+    """Convert a time.monotonic() timestamp to an ISO wall-clock string"""
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp + _MONOTONIC_OFFSET).isoformat()
+
 
+def _format_point(point: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a monitoring point for clients (epoch timestamp -> ISO string)"""
+    return {
+        "timestamp": datetime.fromtimestamp(point["timestamp"]).isoformat(),
+        "values": point["values"]
+    }
 
-@dataclass
+
+@dataclass(slots=True)
 class ExecutionStep:
-    """Command execution step"""
+    """Command execution step
+    
+    start_time/end_time are time.monotonic() values; use to_dict() for
+    display timestamps.
+    """
     step_id: str
     name: str
     status: ExecutionStatus
-    start_time: Optional[datetime] = None
-    end_time: Optional[datetime] = None
-    duration: Optional[float] = None
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
     result: Optional[Any] = None
     error_message: Optional[str] = None
+    
+    @property
+    def duration(self) -> Optional[float]:
+        """Step duration in seconds"""
+        if self.start_time is None or self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return JSON-friendly step summary with ISO timestamps"""
+        return {
+            "step_id": self.step_id,
+            "name": self.name,
+            "status": str(self.status),
+            "start_time": _monotonic_to_iso(self.start_time),
+            "end_time": _monotonic_to_iso(self.end_time),
+            "duration": self.duration,
+            "error_message": self.error_message
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class CommandExecution:
     """Command execution session"""
     execution_id: str
@@ -65,17 +132,47 @@ class CommandExecution:
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     steps: List[ExecutionStep] = field(default_factory=list)
+    _step_index: Dict[str, ExecutionStep] = field(default_factory=dict, init=False, repr=False)
     results: List[ControlResult] = field(default_factory=list)
     progress: float = 0.0
     current_step: Optional[str] = None
     error_message: Optional[str] = None
     
-    # Real-time monitoring data
-    monitoring_data: Dict[str, List[Dict]] = field(default_factory=dict)
+    # Set by cancel_execution to stop the remaining steps
+    _stop_event: asyncio.Event = field(default_factory=asyncio.Event, init=False, repr=False)
+    
+    # Real-time monitoring data (recent 20 points)
+    monitoring_data: Dict[str, Any] = field(default_factory=lambda: {"realtime": deque(maxlen=20)})
     
     # Callback functions
     progress_callbacks: List[Callable] = field(default_factory=list)
     status_callbacks: List[Callable] = field(default_factory=list)
+    monitoring_callbacks: List[Callable] = field(default_factory=list)  # (execution, message bytes)
+
+
+def _snapshot_execution(execution: CommandExecution) -> CommandExecution:
+    """Copy the execution state that changes while it runs
+    
+    Args:
+        execution: Live CommandExecution object
+        
+    Returns:
+        Detached CommandExecution with its own steps, results and monitoring data
+    """
+    steps = [replace(step) for step in execution.steps]
+    snapshot = replace(
+        execution,
+        steps=steps,
+        results=list(execution.results),
+        monitoring_data={
+            **execution.monitoring_data,
+            "realtime": deque(execution.monitoring_data["realtime"], maxlen=20)
+        }
+    )
+    snapshot._step_index = {step.step_id: step for step in steps}
+    if execution._stop_event.is_set():
+        snapshot._stop_event.set()
+    return snapshot
 
 
 class CommandExecutionEngine:
@@ -86,12 +183,44 @@ class CommandExecutionEngine:
     comprehensive workflow management with safety checks and progress tracking.
     """
     
+    # Monitor PVs (temperature-related PVs)
+    MONITOR_PVS = (
+        "KSTAR:PCS:TE:SP",   # Temperature setpoint
+        "KSTAR:PCS:TE:RBV",  # Temperature readback value
+        "KSTAR:COIL:CURR",   # Coil current
+        "KSTAR:HEATER:POW"   # Heater power
+    )
+    
+    # Real-time data broadcast interval (seconds)
+    BROADCAST_INTERVAL = 0.2
+    
+    # Maximum number of cached parse results
+    PARSE_CACHE_SIZE = 256
+    
+    # Background cleanup of finished executions (seconds)
+    CLEANUP_INTERVAL = 60.0
+    EXECUTION_TTL = 300.0
+    
     def __init__(self):
-        self.parser = CommandParser()
+        self.parser = get_parser()
         self.controller = EPICSController()
         self.active_executions: Dict[str, CommandExecution] = {}
+        self._terminal_ids: set = set()  # finished ids in active_executions
+        self._cleanup_task: Optional[asyncio.Task] = None
+        self._id_counter = itertools.count(1)
+        
+        # Exact-match cache of parsed commands keyed by normalized command
+        self._parse_cache: "OrderedDict[str, ParsedCommand]" = OrderedDict()
+        
+        # CA monitor subscriptions shared by concurrent monitoring sessions
+        self._monitors: Dict[str, Any] = {}
+        self._latest: Dict[str, Any] = {}
+        self._sample_queues: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Pending coroutine callback tasks (kept referenced until done)
+        self._callback_tasks: set = set()
         
-        logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
     
     async def execute_command(self, command: str, execution_id: Optional[str] = None) -> CommandExecution:
@@ -106,7 +235,7 @@ class CommandExecutionEngine:
         """
         
         if not execution_id:
-            execution_id = f"cmd_{int(time.time())}"
+            execution_id = f"cmd_{next(self._id_counter)}"
         
         execution = CommandExecution(
             execution_id=execution_id,
@@ -115,80 +244,152 @@ class CommandExecutionEngine:
         )
         
         self.active_executions[execution_id] = execution
+        self._terminal_ids.discard(execution_id)
+        self._ensure_cleanup_task()
         
+        # Subscribe monitors up front so CA channels connect while parsing
+        sample_queue = self._subscribe_monitors()
         try:
-            await self._execute_command_internal(execution)
+            await self._execute_command_internal(execution, sample_queue)
         except Exception as e:
-            execution.status = ExecutionStatus.FAILED
+            # A cancelled execution stays cancelled even if its step fails afterwards
+            if execution.status != ExecutionStatus.CANCELLED:
+                execution.status = ExecutionStatus.FAILED
             execution.error_message = str(e)
-            self.logger.error(f"Command execution failed: {e}")
+            self.logger.error("Command execution failed: %s", e)
         finally:
+            self._unsubscribe_monitors(sample_queue)
             execution.end_time = datetime.now()
             if execution.start_time:
                 execution.progress = 100.0
+            # The cleanup task may already have evicted a cancelled execution
+            if (execution.status in _TERMINAL_STATUSES
+                    and self.active_executions.get(execution_id) is execution):
+                self._terminal_ids.add(execution_id)
         
         return execution
     
-    async def _execute_command_internal(self, execution: CommandExecution):
+    async def _execute_command_internal(self, execution: CommandExecution, sample_queue: asyncio.Queue):
         """Internal command execution logic
         
         Args:
             execution: CommandExecution object to process
+            sample_queue: Monitor sample queue from _subscribe_monitors
         """
         
         execution.start_time = datetime.now()
         execution.status = ExecutionStatus.PARSING
         
         # Step 1: Command parsing
-        await self._add_step(execution, "parsing", "Natural language command parsing")
+        self._add_step(execution, "parsing", "Natural language command parsing")
         try:
-            execution.parsed_command = self.parser.parse_command(execution.original_command)
-            await self._complete_step(execution, "parsing", execution.parsed_command)
+            cached = self._get_cached_parse(execution.original_command)
+            execution.monitoring_data["cache_hit"] = cached is not None
+            if cached is not None:
+                execution.parsed_command = cached
+            else:
+                # Parsing may block on an LLM request; keep it off the event loop
+                execution.parsed_command = await asyncio.to_thread(
+                    self.parser.parse_command, execution.original_command
+                )
+                self._cache_parse(execution.parsed_command)
+            execution.monitoring_data["cache"] = {
+                "cached_tokens": execution.parsed_command.cached_tokens
+            }
+            self._complete_step(execution, "parsing", execution.parsed_command)
             execution.progress = 20.0
         except Exception as e:
-            await self._fail_step(execution, "parsing", str(e))
+            self._fail_step(execution, "parsing", str(e))
             raise
         
+        # cancel_execution may run during any await; stop before the next transition
+        if execution._stop_event.is_set():
+            return
+        
         # Step 2: Safety checks
-        await self._add_step(execution, "safety_check", "Safety validation")
+        self._add_step(execution, "safety_check", "Safety validation")
         try:
             safety_result = await self._perform_safety_checks(execution.parsed_command)
-            await self._complete_step(execution, "safety_check", safety_result)
+            self._complete_step(execution, "safety_check", safety_result)
             execution.progress = 40.0
         except Exception as e:
-            await self._fail_step(execution, "safety_check", str(e))
+            self._fail_step(execution, "safety_check", str(e))
             raise
         
+        if execution._stop_event.is_set():
+            return
+        
         # Step 3: Control command execution
         execution.status = ExecutionStatus.EXECUTING
-        await self._add_step(execution, "execution", "EPICS control command execution")
+        self._add_step(execution, "execution", "EPICS control command execution")
         try:
             execution.results = await self.controller.execute_parsed_command(execution.parsed_command)
-            await self._complete_step(execution, "execution", execution.results)
+            self._complete_step(execution, "execution", execution.results)
             execution.progress = 70.0
         except Exception as e:
-            await self._fail_step(execution, "execution", str(e))
+            self._fail_step(execution, "execution", str(e))
             raise
         
+        if execution._stop_event.is_set():
+            return
+        
         # Step 4: Result monitoring
         execution.status = ExecutionStatus.MONITORING
-        await self._add_step(execution, "monitoring", "Result monitoring")
+        self._add_step(execution, "monitoring", "Result monitoring")
         try:
-            monitoring_result = await self._monitor_results(execution)
-            await self._complete_step(execution, "monitoring", monitoring_result)
+            monitoring_result = await self._monitor_results(execution, sample_queue)
+            self._complete_step(execution, "monitoring", monitoring_result)
             execution.progress = 90.0
         except Exception as e:
-            await self._fail_step(execution, "monitoring", str(e))
+            self._fail_step(execution, "monitoring", str(e))
             # Monitoring failure is not critical
             pass
         
+        if execution._stop_event.is_set():
+            return
+        
         # Step 5: Completion
         execution.status = ExecutionStatus.COMPLETED
         execution.progress = 100.0
         
-        self.logger.info(f"Command execution completed: {execution.execution_id}")
+        self.logger.info("Command execution completed: %s", execution.execution_id)
+    
+    def _get_cached_parse(self, command: str) -> Optional[ParsedCommand]:
+        """Look up a previously parsed command
+        
+        Args:
+            command: Natural language command string
+            
+        Returns:
+            Cached ParsedCommand for this command or None
+        """
+        key = command.strip().lower()
+        cached = self._parse_cache.get(key)
+        if cached is None:
+            return None
+        
+        self._parse_cache.move_to_end(key)
+        return replace(cached, original_command=command)
+    
+    def _cache_parse(self, parsed_command: ParsedCommand):
+        """Store parsed command in the LRU parse cache
+        
+        Fallback results (unknown intent) are not cached so that a failed
+        LLM call is retried next time.
+        
+        Args:
+            parsed_command: ParsedCommand to cache
+        """
+        if parsed_command.intent == "unknown":
+            return
+        
+        key = parsed_command.original_command.strip().lower()
+        self._parse_cache[key] = parsed_command
+        self._parse_cache.move_to_end(key)
+        if len(self._parse_cache) > self.PARSE_CACHE_SIZE:
+            self._parse_cache.popitem(last=False)
     
-    async def _add_step(self, execution: CommandExecution, step_id: str, name: str):
+    def _add_step(self, execution: CommandExecution, step_id: str, name: str):
         """Add execution step
         
         Args:
@@ -200,15 +401,16 @@ class CommandExecutionEngine:
             step_id=step_id,
             name=name,
             status=ExecutionStatus.PENDING,
-            start_time=datetime.now()
+            start_time=time.monotonic()
         )
         execution.steps.append(step)
+        execution._step_index[step_id] = step
         execution.current_step = step_id
         
-        self.logger.info(f"Step started: {name}")
-        await self._notify_status_change(execution)
+        self.logger.info("Step started: %s", name)
+        self._notify_status_change(execution)
     
-    async def _complete_step(self, execution: CommandExecution, step_id: str, result: Any):
+    def _complete_step(self, execution: CommandExecution, step_id: str, result: Any):
         """Complete execution step
         
         Args:
@@ -216,19 +418,16 @@ class CommandExecutionEngine:
             step_id: Step identifier
             result: Step execution result
         """
-        for step in execution.steps:
-            if step.step_id == step_id:
-                step.status = ExecutionStatus.COMPLETED
-                step.end_time = datetime.now()
-                step.result = result
-                if step.start_time:
-                    step.duration = (step.end_time - step.start_time).total_seconds()
-                break
-        
-        self.logger.info(f"Step completed: {step_id}")
-        await self._notify_status_change(execution)
-    
-    async def _fail_step(self, execution: CommandExecution, step_id: str, error_message: str):
+        step = execution._step_index.get(step_id)
+        if step:
+            step.status = ExecutionStatus.COMPLETED
+            step.end_time = time.monotonic()
+            step.result = result
+        
+        self.logger.info("Step completed: %s", step_id)
+        self._notify_status_change(execution)
+    
+    def _fail_step(self, execution: CommandExecution, step_id: str, error_message: str):
         """Fail execution step
         
         Args:
@@ -236,17 +435,14 @@ class CommandExecutionEngine:
             step_id: Step identifier
             error_message: Error description
         """
-        for step in execution.steps:
-            if step.step_id == step_id:
-                step.status = ExecutionStatus.FAILED
-                step.end_time = datetime.now()
-                step.error_message = error_message
-                if step.start_time:
-                    step.duration = (step.end_time - step.start_time).total_seconds()
-                break
-        
-        self.logger.error(f"Step failed: {step_id} - {error_message}")
-        await self._notify_status_change(execution)
+        step = execution._step_index.get(step_id)
+        if step:
+            step.status = ExecutionStatus.FAILED
+            step.end_time = time.monotonic()
+            step.error_message = error_message
+        
+        self.logger.error("Step failed: %s - %s", step_id, error_message)
+        self._notify_status_change(execution)
     
     async def _perform_safety_checks(self, parsed_command: ParsedCommand) -> Dict[str, Any]:
         """Perform safety checks on parsed command
@@ -257,124 +453,373 @@ class CommandExecutionEngine:
         Returns:
             Dictionary with safety check results
         """
-        safety_result = {
-            "passed": True,
-            "checks": [],
-            "warnings": []
-        }
+        commands = parsed_command.control_commands
+        long_running = bool(parsed_command.duration and parsed_command.duration > 60)
         
-        for command in parsed_command.control_commands:
-            # Safety limit check
-            if not self.controller._check_safety_limits(command.pv_name, command.value):
-                safety_result["passed"] = False
-                safety_result["checks"].append({
-                    "type": "safety_limit",
-                    "pv": command.pv_name,
-                    "value": command.value,
-                    "status": "FAILED"
-                })
-            else:
-                safety_result["checks"].append({
+        # Nothing to check for commands without control actions
+        if not commands and not long_running:
+            return {"passed": True, "checks": [], "warnings": []}
+        
+        # Safety limit check
+        limits_ok = [
+            self.controller._check_safety_limits(command.pv_name, command.value)
+            for command in commands
+        ]
+        
+        safety_result = {
+            "passed": all(limits_ok),
+            "checks": [
+                {
                     "type": "safety_limit",
                     "pv": command.pv_name,
                     "value": command.value,
-                    "status": "PASSED"
-                })
+                    "status": "PASSED" if ok else "FAILED"
+                }
+                for command, ok in zip(commands, limits_ok)
+            ],
+            "warnings": []
+        }
         
         # Additional safety checks
-        if parsed_command.duration and parsed_command.duration > 60:
+        if long_running:
             safety_result["warnings"].append("Long-term control execution - caution required")
         
         return safety_result
     
-    async def _monitor_results(self, execution: CommandExecution) -> Dict[str, Any]:
+    async def _monitor_results(self, execution: CommandExecution, sample_queue: asyncio.Queue) -> Dict[str, Any]:
         """Monitor command execution results
         
+        Samples are streamed into the realtime window and broadcast as they
+        arrive; only the window is kept, not the full sample history.
+        
         Args:
             execution: CommandExecution object
+            sample_queue: Monitor sample queue from _subscribe_monitors
             
         Returns:
             Dictionary with monitoring results
         """
         monitoring_result = {
             "monitoring_time": 10.0,  # 10초간 모니터링
-            "data_points": [],
+            "sample_count": 0,
             "success_rate": 0.0
         }
         
         if not execution.results:
             return monitoring_result
         
-        # Monitor PVs (temperature-related PVs)
-        monitor_pvs = [
-            "KSTAR:PCS:TE:SP",   # Temperature setpoint
-            "KSTAR:PCS:TE:RBV",  # Temperature readback value
-            "KSTAR:COIL:CURR",   # Coil current
-            "KSTAR:HEATER:POW"   # Heater power
-        ]
+        realtime = execution.monitoring_data["realtime"]
+        async for new_points in self._monitor_stream(sample_queue, monitoring_result["monitoring_time"],
+                                                     execution._stop_event):
+            evicted = max(0, len(realtime) + len(new_points) - realtime.maxlen)
+            realtime.extend(new_points)
+            monitoring_result["sample_count"] += len(new_points)
+            
+            # Broadcast real-time data via WebSocket (only when someone listens)
+            if execution.monitoring_callbacks:
+                await self._broadcast_monitoring_data(execution, new_points, evicted)
+        
+        # Calculate success rate
+        successful_commands = sum(1 for r in execution.results if r.success)
+        monitoring_result["success_rate"] = successful_commands / len(execution.results)
         
-        # Collect monitoring data
-        start_time = time.time()
-        data_points = []
+        return monitoring_result
+    
+    async def _monitor_stream(self, sample_queue: asyncio.Queue, monitoring_time: float,
+                              stop_event: asyncio.Event) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Stream monitoring points in batches, one batch per broadcast interval
         
-        while time.time() - start_time < monitoring_result["monitoring_time"]:
-            point = {
-                "timestamp": datetime.now().isoformat(),
-                "values": {}
-            }
+        Points are built from CA monitor updates as they arrive. Until a CA
+        monitor has delivered an update (demo mode, no IOC reachable), the
+        PVs are polled once per interval instead.
+        Timestamps are epoch seconds, formatted by consumers.
+        
+        Args:
+            sample_queue: Monitor sample queue from _subscribe_monitors
+            monitoring_time: Monitoring duration in seconds
+            stop_event: Ends the stream early when set
             
-            for pv_name in monitor_pvs:
-                value = self.controller.get_pv_value(pv_name)
-                point["values"][pv_name] = value
+        Yields:
+            Points collected since the previous batch (may be empty)
+        """
+        loop = asyncio.get_running_loop()
+        now = loop.time()  # read once per tick
+        deadline = now + monitoring_time
+        next_flush = now
+        batch = []
+        
+        values = None
+        while not stop_event.is_set() and (now := loop.time()) < deadline:
+            if now >= next_flush:
+                # First point, or no monitor update yet: poll
+                if values is None or not self._latest:
+                    values = await self._read_monitored_pvs()
+                    batch.append({
+                        "timestamp": time.time(),
+                        "values": values
+                    })
+                
+                yield batch
+                batch = []
+                next_flush += self.BROADCAST_INTERVAL
+                now = loop.time()
             
-            data_points.append(point)
-            execution.monitoring_data["realtime"] = data_points[-20:]  # Keep recent 20 points
+            # Drain monitor updates until the next flush
+            try:
+                sample = await asyncio.wait_for(
+                    sample_queue.get(),
+                    timeout=max(0.0, min(deadline, next_flush) - now)
+                )
+            except asyncio.TimeoutError:
+                continue
             
-            # Broadcast real-time data via WebSocket
-            await self._broadcast_monitoring_data(execution)
+            if sample is None:  # wake-up from cancel_execution
+                continue
             
-            await asyncio.sleep(0.2)  # Sample every 0.2 seconds
+            timestamp, pv_name, value = sample
+            values = {**values, pv_name: value}
+            batch.append({
+                "timestamp": timestamp,
+                "values": values
+            })
+        
+        if batch:
+            yield batch
+    
+    def _subscribe_monitors(self) -> asyncio.Queue:
+        """Subscribe to CA monitors for MONITOR_PVS
         
-        monitoring_result["data_points"] = data_points
+        Subscriptions are shared between concurrent monitoring sessions and
+        push the latest values into a cache, so sampling does not need a
+        network round trip per read. Each session gets its own queue of
+        (timestamp, pv_name, value) samples.
         
-        # Calculate success rate
-        successful_commands = sum(1 for r in execution.results if r.success)
-        monitoring_result["success_rate"] = successful_commands / len(execution.results)
+        Returns:
+            Queue receiving monitor updates for this session
+        """
+        sample_queue = asyncio.Queue()
+        self._sample_queues.add(sample_queue)
+        self._loop = asyncio.get_running_loop()
+        
+        if self._monitors_enabled() and not self._monitors:
+            for pv_name in self.MONITOR_PVS:
+                self._monitors[pv_name] = epics.PV(
+                    pv_name,
+                    auto_monitor=True,
+                    callback=self._on_monitor_update
+                )
+        
+        return sample_queue
+    
+    def _monitors_enabled(self) -> bool:
+        """Whether CA monitors can be used for MONITOR_PVS
         
-        return monitoring_result
+        Requires pyepics and a controller that talks to real PVs; a demo
+        mode controller simulates the values itself.
+        """
+        return EPICS_AVAILABLE and not getattr(self.controller, "demo_mode", False)
+    
+    def _monitors_connected(self) -> bool:
+        """Whether any CA monitor channel is connected"""
+        return any(pv.connected for pv in self._monitors.values())
+    
+    def _unsubscribe_monitors(self, sample_queue: asyncio.Queue):
+        """Release CA monitors once the last monitoring session ends
+        
+        Args:
+            sample_queue: Queue returned by _subscribe_monitors
+        """
+        self._sample_queues.discard(sample_queue)
+        if self._sample_queues:
+            return
+        
+        for pv in self._monitors.values():
+            pv.clear_auto_monitor()
+        self._monitors.clear()
+        self._latest.clear()
+    
+    def _on_monitor_update(self, pvname: str = None, value: Any = None, timestamp: float = None, **kwargs):
+        """CA monitor callback (called from the CA thread)
+        
+        Args:
+            pvname: Name of the updated PV
+            value: New PV value
+            timestamp: CA timestamp of the update
+        """
+        self._latest[pvname] = value
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(
+                self._dispatch_sample, (timestamp or time.time(), pvname, value)
+            )
+    
+    def _dispatch_sample(self, sample: tuple):
+        """Fan a monitor update out to all monitoring sessions (event loop thread)
+        
+        Args:
+            sample: (timestamp, pv_name, value) tuple
+        """
+        for sample_queue in self._sample_queues:
+            sample_queue.put_nowait(sample)
+    
+    async def _read_monitored_pvs(self) -> Dict[str, Any]:
+        """Read all MONITOR_PVS in one pass
+        
+        Values come from the monitor cache. PVs without a monitor update
+        yet are fetched together with one caget_many() call while the
+        monitor channels are connected; otherwise (demo mode, no IOC
+        reachable) they are read through the controller. Both reads may
+        block on Channel Access, so they run in a worker thread.
+        
+        Returns:
+            Dictionary of PV name to latest value
+        """
+        values = {pv_name: self._latest.get(pv_name) for pv_name in self.MONITOR_PVS}
+        missing = [pv_name for pv_name, value in values.items() if value is None]
+        if not missing:
+            return values
+        
+        if self._monitors_connected():
+            fetched = await asyncio.to_thread(epics.caget_many, missing)
+        else:
+            fetched = await asyncio.to_thread(
+                lambda: [self.controller.get_pv_value(pv_name) for pv_name in missing]
+            )
+        values.update(zip(missing, fetched))
+        return values
+    
+    def get_monitoring_snapshot(self, execution: CommandExecution) -> bytes:
+        """Serialize the full realtime window for a newly connected client
+        
+        After the snapshot, clients only receive the incremental messages
+        sent to monitoring_callbacks.
+        
+        Args:
+            execution: CommandExecution object
+            
+        Returns:
+            JSON-encoded snapshot message
+        """
+        return orjson.dumps({
+            "type": "monitoring_snapshot",
+            "execution_id": execution.execution_id,
+            "realtime": [_format_point(point) for point in execution.monitoring_data["realtime"]]
+        })
     
-    async def _broadcast_monitoring_data(self, execution: CommandExecution):
+    async def _broadcast_monitoring_data(self, execution: CommandExecution,
+                                         new_points: List[Dict[str, Any]], evicted: int):
         """Broadcast monitoring data via WebSocket
         
+        Sends only the change since the last broadcast: the new points and
+        how many old points left the realtime window. The message is
+        serialized once and shared by all monitoring callbacks.
+        
         Args:
             execution: CommandExecution object
+            new_points: Points added since the last broadcast
+            evicted: Number of points dropped from the realtime window
         """
-        # This method is called from UI via WebSocket connection
-        pass
+        if not execution.monitoring_callbacks or not new_points:
+            return
+        
+        message = orjson.dumps({
+            "type": "monitoring_update",
+            "execution_id": execution.execution_id,
+            "append": [_format_point(point) for point in new_points],
+            "evict": evicted
+        })
+        
+        await self._run_callbacks(execution.monitoring_callbacks, "Monitoring", execution, message)
     
-    async def _notify_status_change(self, execution: CommandExecution):
+    def _notify_status_change(self, execution: CommandExecution):
         """Notify status change to callbacks
         
         Args:
             execution: CommandExecution object
         """
-        for callback in execution.status_callbacks:
-            try:
-                await callback(execution)
-            except Exception as e:
-                self.logger.error(f"Status callback error: {e}")
+        self._dispatch_callbacks(execution.status_callbacks, "Status", execution)
     
-    async def _notify_progress_change(self, execution: CommandExecution):
+    def _notify_progress_change(self, execution: CommandExecution):
         """Notify progress change to callbacks
         
         Args:
             execution: CommandExecution object
         """
-        for callback in execution.progress_callbacks:
+        self._dispatch_callbacks(execution.progress_callbacks, "Progress", execution)
+    
+    def _dispatch_callbacks(self, callbacks: List[Callable], kind: str, *args):
+        """Call callbacks without waiting for the awaitables they return
+        
+        Step transitions do not suspend the execution; returned awaitables
+        run together in a background task. Since the execution keeps moving
+        while they wait to run, callbacks receive a snapshot of the
+        execution taken at dispatch time instead of the live object.
+        
+        Args:
+            callbacks: Plain or async callback functions
+            kind: Callback kind used in error logs
+            *args: Arguments passed to each callback
+        """
+        if not callbacks:
+            return
+        
+        args = tuple(
+            _snapshot_execution(arg) if isinstance(arg, CommandExecution) else arg
+            for arg in args
+        )
+        awaitables = self._call_callbacks(callbacks, kind, *args)
+        if awaitables:
+            task = asyncio.create_task(self._await_callbacks(awaitables, kind))
+            self._callback_tasks.add(task)
+            task.add_done_callback(self._callback_tasks.discard)
+    
+    async def _run_callbacks(self, callbacks: List[Callable], kind: str, *args):
+        """Call callbacks and wait for the awaitables they return
+        
+        Args:
+            callbacks: Plain or async callback functions
+            kind: Callback kind used in error logs
+            *args: Arguments passed to each callback
+        """
+        awaitables = self._call_callbacks(callbacks, kind, *args)
+        if awaitables:
+            await self._await_callbacks(awaitables, kind)
+    
+    def _call_callbacks(self, callbacks: List[Callable], kind: str, *args) -> List[Awaitable]:
+        """Call each callback and collect the awaitables returned
+        
+        Checking the result rather than the callback also covers async
+        callable objects, partials and plain functions returning coroutines.
+        
+        Args:
+            callbacks: Plain or async callback functions
+            kind: Callback kind used in error logs
+            *args: Arguments passed to each callback
+            
+        Returns:
+            Awaitables returned by the callbacks
+        """
+        awaitables = []
+        for callback in callbacks:
             try:
-                await callback(execution)
+                result = callback(*args)
             except Exception as e:
-                self.logger.error(f"Progress callback error: {e}")
+                self.logger.error("%s callback error: %s", kind, e)
+                continue
+            if inspect.isawaitable(result):
+                awaitables.append(result)
+        return awaitables
+    
+    async def _await_callbacks(self, awaitables: List[Awaitable], kind: str):
+        """Wait for callback awaitables concurrently and log their failures
+        
+        Args:
+            awaitables: Awaitables returned by callbacks
+            kind: Callback kind used in error logs
+        """
+        results = await asyncio.gather(*awaitables, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error("%s callback error: %s", kind, result)
     
     def get_execution_status(self, execution_id: str) -> Optional[CommandExecution]:
         """Get execution status
@@ -400,7 +845,13 @@ class CommandExecutionEngine:
             execution = self.active_executions[execution_id]
             execution.status = ExecutionStatus.CANCELLED
             execution.end_time = datetime.now()
-            self.logger.info(f"Execution cancelled: {execution_id}")
+            
+            # Stop the execution and wake monitoring sessions immediately
+            execution._stop_event.set()
+            for queue in self._sample_queues:
+                queue.put_nowait(None)
+            self._terminal_ids.add(execution_id)
+            self.logger.info("Execution cancelled: %s", execution_id)
             return True
         return False
     
@@ -412,23 +863,67 @@ class CommandExecutionEngine:
         """
         return list(self.active_executions.values())
     
-    def cleanup_completed_executions(self):
+    def cleanup_completed_executions(self, max_age: Optional[float] = None):
         """Clean up completed executions
         
         Removes completed, failed, or cancelled executions from memory
         to prevent memory leaks in long-running applications.
+        
+        Args:
+            max_age: Only remove executions that ended at least this many
+                seconds ago (all terminal executions if None)
         """
+        now = datetime.now()
         completed_ids = []
-        for execution_id, execution in self.active_executions.items():
-            if execution.status in [ExecutionStatus.COMPLETED, ExecutionStatus.FAILED, ExecutionStatus.CANCELLED]:
+        for execution_id in self._terminal_ids:
+            execution = self.active_executions.get(execution_id)
+            if execution is None:
+                # Already evicted; just drop the stale id
                 completed_ids.append(execution_id)
+                continue
+            if max_age is not None and execution.end_time and (now - execution.end_time).total_seconds() < max_age:
+                continue
+            completed_ids.append(execution_id)
         
         for execution_id in completed_ids:
-            del self.active_executions[execution_id]
+            self.active_executions.pop(execution_id, None)
+        self._terminal_ids.difference_update(completed_ids)
         
         if completed_ids:
-            self.logger.info(f"Completed executions cleaned up: {len(completed_ids)}")
-
+            self.logger.info("Completed executions cleaned up: %s", len(completed_ids))
+    
+    def _ensure_cleanup_task(self):
+        """Start the background cleanup task if it is not running"""
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+    
+    async def _cleanup_loop(self):
+        """Periodically evict terminal executions older than EXECUTION_TTL
+        
+        Errors are logged and the loop keeps running, so one failed pass
+        does not stop eviction for the lifetime of the engine.
+        """
+        while True:
+            await asyncio.sleep(self.CLEANUP_INTERVAL)
+            try:
+                self.cleanup_completed_executions(max_age=self.EXECUTION_TTL)
+            except Exception:
+                self.logger.exception("Execution cleanup error")
+    
+    async def shutdown(self):
+        """Stop the background cleanup task
+        
+        Call when the engine is no longer used (e.g. on application shutdown).
+        """
+        task, self._cleanup_task = self._cleanup_task, None
+        if task is None or task.done():
+            return
+        
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
 # Test function
 async def test_execution_engine():
@@ -450,5 +945,42 @@ async def test_execution_engine():
         print(f"  - {step.name}: {step.status}")
 
 
+async def test_execution_cancellation():
+    """Test that cancelling during each step leaves the execution cancelled"""
+    
+    def delayed(func):
+        """Wrap a step call so it finishes normally after a short delay"""
+        if inspect.iscoroutinefunction(func):
+            async def wrapper(*args, **kwargs):
+                await asyncio.sleep(0.3)
+                return await func(*args, **kwargs)
+        else:
+            def wrapper(*args, **kwargs):
+                time.sleep(0.3)
+                return func(*args, **kwargs)
+        return wrapper
+    
+    command = "Raise plasma temperature to 10 keV"
+    for step_id in ("parsing", "safety_check", "execution", "monitoring"):
+        engine = CommandExecutionEngine()
+        engine.parser = type("DelayedParser", (), {
+            "parse_command": staticmethod(delayed(engine.parser.parse_command))
+        })()
+        engine._perform_safety_checks = delayed(engine._perform_safety_checks)
+        engine.controller.execute_parsed_command = delayed(engine.controller.execute_parsed_command)
+        
+        task = asyncio.create_task(engine.execute_command(command, "cancel_test"))
+        execution = engine.get_execution_status("cancel_test")
+        while execution is None or execution.current_step != step_id:
+            await asyncio.sleep(0.01)
+            execution = engine.get_execution_status("cancel_test")
+        
+        engine.cancel_execution("cancel_test")
+        execution = await task
+        
+        print(f"Cancel during {step_id}: {execution.status} (last step: {execution.current_step})")
+        assert execution.status == ExecutionStatus.CANCELLED, f"cancel during {step_id} ended as {execution.status}"
+
+
 if __name__ == "__main__":
     asyncio.run(test_execution_engine())
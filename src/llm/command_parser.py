@@ -18,26 +18,276 @@ current values gradually follow. Future versions will integrate with
 sophisticated plasma physics models and machine learning algorithms.
 """
 
+import asyncio
+import functools
+import hashlib
+import logging
 import os
-import json
 import re
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-from datetime import datetime, timedelta
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, Optional, Tuple
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
+from types import MappingProxyType
 
-from openai import OpenAI
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
+# Heavy or optional dependencies are imported where they are first needed
+# (the OpenAI client, the opt-in semantic cache and the persistent cache)
+if TYPE_CHECKING:
+    import numpy as np
+    from openai import OpenAI
+
 # Load .env file
 project_root = Path(__file__).parent.parent.parent
 env_file = project_root / ".env"
 if env_file.exists():
     load_dotenv(env_file)
 
+# Shared OpenAI client so that all parsers reuse one HTTP connection pool
+# (sized for concurrent parse_commands bursts, kept alive between requests)
+_OPENAI_CLIENT: Optional["OpenAI"] = None
+_OPENAI_CLIENT_LOCK = threading.Lock()
+
+
+def _get_openai_client() -> Optional["OpenAI"]:
+    """Return the shared OpenAI client, or None without an API key
+    
+    Created on first use rather than at import, so that a key loaded by
+    the caller after importing this module (main.py's config.env.example
+    fallback) is still picked up.
+    """
+    global _OPENAI_CLIENT
+    with _OPENAI_CLIENT_LOCK:
+        if _OPENAI_CLIENT is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if api_key:
+                import httpx
+                from openai import DefaultHttpxClient, OpenAI
+                
+                _OPENAI_CLIENT = OpenAI(
+                    api_key=api_key,
+                    timeout=30.0,
+                    http_client=DefaultHttpxClient(
+                        limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+                    )
+                )
+        return _OPENAI_CLIENT
+
+# Static system prompt for LLM parsing.
+# Kept constant and placed before the user message so that it forms a stable
+# prefix (>1024 tokens) eligible for OpenAI automatic prompt caching.
+SYSTEM_PROMPT = """
+You are an expert in KSTAR plasma control systems.
+Analyze natural language commands and convert them to EPICS control commands.
+Commands may be written in English or Korean.
+
+Available control devices:
+- Coil current (KSTAR:COIL:CURR): 0-2000A, used for temperature control
+- Heater power (KSTAR:HEATER:POW): 0-100%, used for temperature control
+- Gas injection (KSTAR:GAS:FLOW): 0-1000sccm, used for density control
+- Magnetic field (KSTAR:MAGNET:BT): 0-3.5T, used for plasma stabilization
+- Pump speed (KSTAR:PUMP:SPEED): used for density control
+- Pressure setpoint (KSTAR:PRESSURE:SP): used for density control
+- ECH power (KSTAR:ECH:POWER): electron cyclotron heating
+- ICRH power (KSTAR:ICRH:POWER): ion cyclotron resonance heating
+- NBI power (KSTAR:NBI:POWER): neutral beam injection heating
+
+Monitored process variables:
+- KSTAR:PCS:TE:SP: Electron temperature setpoint (keV)
+- KSTAR:PCS:TE:RBV: Electron temperature readback value (keV)
+- KSTAR:COIL:CURR: Coil current (A)
+- KSTAR:HEATER:POW: Heater power (%)
+
+Control rules:
+- The reference plasma temperature is 8 keV.
+- To raise the temperature, increase both coil current and heater power.
+  Coil current = min(1500 + (target - 8) * 100, 2000) A
+  Heater power = min(70 + (target - 8) * 5, 100) %
+- To lower the temperature, decrease both coil current and heater power.
+  Coil current = max(1000 - (8 - target) * 50, 500) A
+  Heater power = max(30 - (8 - target) * 3, 10) %
+- Never emit a value outside the device range listed above.
+- Use priority 1 for primary actuators, 2 for supporting actuators and
+  3 for optional adjustments.
+- If the command specifies a time ("for 5 seconds", "3분 동안"), convert it
+  to seconds and return it as "duration". Otherwise return null.
+- "estimated_time" is the expected execution time in seconds; use the
+  duration when given, otherwise 10.
+- If the command cannot be mapped to any device, return intent "unknown",
+  an empty "control_commands" list and safety_checks ["manual_review"].
+- Respond with a single JSON object only, without markdown or comments.
+
+Response format:
+{
+    "intent": "temperature_control|density_control|heating_control|combined_control",
+    "target_value": numeric_value,
+    "duration": time_in_seconds,
+    "control_commands": [
+        {
+            "pv_name": "PV_name",
+            "value": numeric_value,
+            "unit": "unit",
+            "description": "description",
+            "priority": 1
+        }
+    ],
+    "safety_checks": ["check1", "check2"],
+    "estimated_time": estimated_execution_time
+}
+
+Examples:
+
+Command: Raise plasma temperature to 10 keV
+{
+    "intent": "temperature_control",
+    "target_value": 10.0,
+    "duration": null,
+    "control_commands": [
+        {"pv_name": "KSTAR:COIL:CURR", "value": 1700.0, "unit": "A", "description": "Temperature control via coil current for 10.0 keV", "priority": 1},
+        {"pv_name": "KSTAR:HEATER:POW", "value": 80.0, "unit": "%", "description": "Temperature control via heater power for 10.0 keV", "priority": 1}
+    ],
+    "safety_checks": ["temperature_range", "heating_power_limit"],
+    "estimated_time": 10.0
+}
+
+Command: Set temperature to 12 keV for 3 seconds
+{
+    "intent": "temperature_control",
+    "target_value": 12.0,
+    "duration": 3.0,
+    "control_commands": [
+        {"pv_name": "KSTAR:COIL:CURR", "value": 1900.0, "unit": "A", "description": "Temperature control via coil current for 12.0 keV", "priority": 1},
+        {"pv_name": "KSTAR:HEATER:POW", "value": 90.0, "unit": "%", "description": "Temperature control via heater power for 12.0 keV", "priority": 1}
+    ],
+    "safety_checks": ["temperature_range", "heating_power_limit"],
+    "estimated_time": 3.0
+}
+
+Command: 온도를 6 keV로 낮춰
+{
+    "intent": "temperature_control",
+    "target_value": 6.0,
+    "duration": null,
+    "control_commands": [
+        {"pv_name": "KSTAR:COIL:CURR", "value": 900.0, "unit": "A", "description": "Temperature control via coil current reduction for 6.0 keV", "priority": 1},
+        {"pv_name": "KSTAR:HEATER:POW", "value": 24.0, "unit": "%", "description": "Temperature control via heater power reduction for 6.0 keV", "priority": 1}
+    ],
+    "safety_checks": ["temperature_range", "heating_power_limit"],
+    "estimated_time": 10.0
+}
+
+Command: Increase heater power to 80%
+{
+    "intent": "heating_control",
+    "target_value": 80.0,
+    "duration": null,
+    "control_commands": [
+        {"pv_name": "KSTAR:HEATER:POW", "value": 80.0, "unit": "%", "description": "Set heater power to 80%", "priority": 1}
+    ],
+    "safety_checks": ["heating_power_limit"],
+    "estimated_time": 10.0
+}
+
+Command: Set coil current to 1500A
+{
+    "intent": "temperature_control",
+    "target_value": 1500.0,
+    "duration": null,
+    "control_commands": [
+        {"pv_name": "KSTAR:COIL:CURR", "value": 1500.0, "unit": "A", "description": "Set coil current to 1500 A", "priority": 1}
+    ],
+    "safety_checks": ["coil_current_limit"],
+    "estimated_time": 10.0
+}
+
+Command: Increase gas flow to 300 sccm for 2 minutes
+{
+    "intent": "density_control",
+    "target_value": 300.0,
+    "duration": 120.0,
+    "control_commands": [
+        {"pv_name": "KSTAR:GAS:FLOW", "value": 300.0, "unit": "sccm", "description": "Density control via gas injection", "priority": 1}
+    ],
+    "safety_checks": ["gas_flow_limit"],
+    "estimated_time": 120.0
+}
+"""
+
+# Fingerprint of the prompt; persisted LLM results are only valid for it
+_PROMPT_HASH = hashlib.sha256(SYSTEM_PROMPT.encode()).hexdigest()[:16]
+
+
+# Demo mode temperature extraction patterns (applied to lower-cased command, in order)
+_DEMO_TEMP_PATTERNS = tuple(re.compile(p) for p in (
+    r'(?:temperature|temp|온도).*?(\d+(?:\.\d+)?)\s*(?:keV|kev|도)',
+    r'(\d+(?:\.\d+)?)\s*(?:keV|kev|도)',
+    r'(?:to|올려|낮춰|설정).*?(\d+(?:\.\d+)?)',
+    r'(\d+(?:\.\d+)?)'
+))
+
+# Quick-parse temperature control pattern (raise/lower/set/hold verbs in one pass)
+_QUICK_TEMP_RE = re.compile(
+    r'온도를?\s*(\d+(?:\.\d+)?)\s*(?:keV|도|도씨)?\s*(?:로|으로)?\s*'
+    r'(?:올려|높여|증가|내려|낮춰|감소|설정|조절|유지)'
+)
+
+# KSTAR control mapping table (read-only, shared by all parsers)
+_CONTROL_MAPPINGS = MappingProxyType({
+    "temperature": MappingProxyType({
+        "coil_current": "KSTAR:COIL:CURR",
+        "heater_power": "KSTAR:HEATER:POW",
+        "gas_flow": "KSTAR:GAS:FLOW",
+        "magnetic_field": "KSTAR:MAGNET:BT"
+    }),
+    "density": MappingProxyType({
+        "gas_flow": "KSTAR:GAS:FLOW",
+        "pump_speed": "KSTAR:PUMP:SPEED",
+        "pressure": "KSTAR:PRESSURE:SP"
+    }),
+    "heating": MappingProxyType({
+        "ech_power": "KSTAR:ECH:POWER",
+        "icrh_power": "KSTAR:ICRH:POWER",
+        "nbi_power": "KSTAR:NBI:POWER"
+    })
+})
+
+# Numbers in a command; semantic cache hits must agree on all of them
+_NUMBER_RE = re.compile(r'\d+(?:\.\d+)?')
 
-@dataclass
+# Direction words; semantic cache hits must move their targets the same way
+# ("increase" and "decrease" embed almost identically)
+_DIRECTION_PATTERNS = (
+    ("up", re.compile(r'\b(?:increase|raise|boost|up|higher)\b|올려|올리|높|증가|상승')),
+    ("down", re.compile(r'\b(?:decrease|lower|reduce|drop|down|cut)\b|내려|내리|낮|감소|하강|줄')),
+    ("stop", re.compile(r'\b(?:stop|abort|halt|off|disable)\b|정지|중지|멈|꺼'))
+)
+
+# Absolute ("to 10") vs relative ("by 10") value wording; hits must agree
+_VALUE_MODE_PATTERNS = (
+    ("absolute", re.compile(r'\b(?:to|at)\b|까지|로\s*(?:설정|맞춰|유지)')),
+    ("relative", re.compile(r'\bby\b|만큼'))
+)
+
+# Negation ("don't increase"); a negated command never matches a plain one
+_NEGATION_RE = re.compile(r"\b(?:not|never|no)\b|n't\b|않|하지\s*마|말고|금지")
+
+# Control target keywords; semantic cache hits must address the same targets
+_TARGET_RE = re.compile(
+    r'temperature|density|current|coil|heat(?:er|ing)?|power|field|pressure|ech|icrh|nbi'
+    r'|온도|밀도|전류|코일|가열|히터|출력|자기장|압력'
+)
+
+# Duration patterns with their multiplier to seconds
+_DURATION_PATTERNS = tuple((re.compile(p), multiplier) for p, multiplier in (
+    (r'(\d+)\s*초\s*(?:동안|간)', 1.0),
+    (r'(\d+)\s*분\s*(?:동안|간)', 60.0),
+    (r'(\d+)\s*시간\s*(?:동안|간)', 3600.0)
+))
+
+@dataclass(slots=True, frozen=True)
 class ControlCommand:
     """EPICS control command data class"""
     pv_name: str
@@ -47,7 +297,7 @@ class ControlCommand:
     priority: int = 1  # 1=high, 2=medium, 3=low
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ParsedCommand:
     """Parsed natural language command"""
     original_command: str
@@ -57,48 +307,99 @@ class ParsedCommand:
     control_commands: List[ControlCommand]
     safety_checks: List[str]
     estimated_time: float  # estimated execution time (seconds)
+    cached_tokens: int = 0  # prompt tokens served from the OpenAI prompt cache
+
+
+# Temperature control command templates (value and target filled in per call)
+_COIL_TEMPLATE = ControlCommand("KSTAR:COIL:CURR", 0.0, "A", "Temperature control via coil current", 1)
+_COIL_REDUCTION_TEMPLATE = replace(_COIL_TEMPLATE, description="Temperature control via coil current reduction")
+_HEATER_TEMPLATE = ControlCommand("KSTAR:HEATER:POW", 0.0, "%", "Temperature control via heater power", 1)
+_HEATER_REDUCTION_TEMPLATE = replace(_HEATER_TEMPLATE, description="Temperature control via heater power reduction")
+
+# Temperature control empirical formulas (reference temperature 8 keV):
+# (template, (base, slope)) on increase, the same on decrease, then the
+# min/max clamp of the value
+_TEMP_CONTROL_FORMULAS = (
+    ((_COIL_TEMPLATE, (1500, 100)), (_COIL_REDUCTION_TEMPLATE, (1000, 50)), 500, 2000),
+    ((_HEATER_TEMPLATE, (70, 5)), (_HEATER_REDUCTION_TEMPLATE, (30, 3)), 10, 100)
+)
+
+
+class ControlCommandSchema(BaseModel):
+    """LLM structured output schema for a control command"""
+    pv_name: str
+    value: float
+    unit: str
+    description: str
+    priority: int = Field(description="1=high, 2=medium, 3=low")
 
 
+class ParsedCommandSchema(BaseModel):
+    """LLM structured output schema for a parsed command"""
+    intent: str = Field(description="temperature_control|density_control|heating_control|combined_control|unknown")
+    target_value: Optional[float]
+    duration: Optional[float] = Field(description="Duration in seconds")
+    control_commands: List[ControlCommandSchema]
+    safety_checks: List[str]
+    estimated_time: float = Field(description="Estimated execution time in seconds")
+
 class CommandParser:
     """Natural language command parser
     
     This class handles the translation of natural language commands into
     structured EPICS control commands. It supports both LLM-based parsing
     and fallback rule-based parsing for demo mode.
+    
+    parse_command is thread-safe: mappings and patterns are read-only and
+    the result caches are locked, so one instance (see get_parser) can be
+    shared by all callers.
     """
     
+    # KSTAR control mapping table
+    control_mappings = _CONTROL_MAPPINGS
+    
+    # Semantic cache of LLM results (paraphrased commands reuse an answer);
+    # opt-in, since a wrong hit sends another command's setpoints
+    SEMANTIC_CACHE_ENABLED = False
+    EMBEDDING_MODEL = "text-embedding-3-small"
+    SEMANTIC_CACHE_SIZE = 1024
+    SEMANTIC_SIMILARITY = 0.92
+    
+    # Persistent cache of LLM results across restarts (requires diskcache)
+    PERSISTENT_CACHE_DIR = Path.home() / ".cache" / "kstar_mcp" / "parser"
+    PERSISTENT_CACHE_TTL = 86400  # seconds
+    
+    # Maximum concurrent parses (LLM requests) in parse_commands
+    MAX_CONCURRENT_PARSES = 10
+    
     def __init__(self):
-        # Initialize OpenAI client (with demo mode support)
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            self._client = OpenAI(api_key=api_key)
+        self.logger = logging.getLogger(__name__)
+        
+        # Use shared OpenAI client (with demo mode support)
+        client = _get_openai_client()
+        if client is not None:
+            self._client = client
             self.model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
             self.demo_mode = False
         else:
             self._client = None
             self.model = None
             self.demo_mode = True
-            print("⚠️  OpenAI API key not found. Running in demo mode.")
-        
-        # KSTAR control mapping table
-        self.control_mappings = {
-            "temperature": {
-                "coil_current": "KSTAR:COIL:CURR",
-                "heater_power": "KSTAR:HEATER:POW", 
-                "gas_flow": "KSTAR:GAS:FLOW",
-                "magnetic_field": "KSTAR:MAGNET:BT"
-            },
-            "density": {
-                "gas_flow": "KSTAR:GAS:FLOW",
-                "pump_speed": "KSTAR:PUMP:SPEED",
-                "pressure": "KSTAR:PRESSURE:SP"
-            },
-            "heating": {
-                "ech_power": "KSTAR:ECH:POWER",
-                "icrh_power": "KSTAR:ICRH:POWER",
-                "nbi_power": "KSTAR:NBI:POWER"
-            }
-        }
+            self.logger.warning("⚠️  OpenAI API key not found. Running in demo mode.")
+        
+        # command -> (semantic key, unit embedding, ParsedCommand), in LRU order
+        self._semantic_cache: "OrderedDict[str, Tuple[Tuple, np.ndarray, ParsedCommand]]" = OrderedDict()
+        self._semantic_lock = threading.Lock()  # parse_command runs in worker threads
+        
+        # LLM results persisted across restarts
+        self._disk_cache = None
+        if not self.demo_mode:
+            try:
+                import diskcache
+            except ImportError:
+                pass
+            else:
+                self._disk_cache = diskcache.Cache(str(self.PERSISTENT_CACHE_DIR))
     
     @property
     def client(self):
@@ -124,8 +425,185 @@ class CommandParser:
         if quick_parse:
             return quick_parse
         
-        # Step 2: Use LLM for advanced parsing
-        return self._llm_parse(command)
+        # Step 2: Reuse the LLM answer of the same command from an earlier run
+        persisted = self._load_persisted(command)
+        if persisted:
+            return persisted
+        
+        # Step 3: Reuse the LLM answer of an equivalent earlier command
+        embedding = self._embed_command(command) if self.SEMANTIC_CACHE_ENABLED else None
+        if embedding is not None:
+            cached = self._semantic_lookup(command, embedding)
+            if cached:
+                return cached
+        
+        # Step 4: Use LLM for advanced parsing
+        parsed = self._llm_parse(command)
+        if parsed.intent != "unknown":
+            self._persist(command, parsed)
+            if embedding is not None:
+                self._semantic_store(command, embedding, parsed)
+        return parsed
+    
+    async def parse_commands(self, commands: List[str]) -> List[ParsedCommand]:
+        """Parse several commands concurrently
+        
+        Each command is parsed in a worker thread so that LLM requests
+        overlap; at most MAX_CONCURRENT_PARSES run at once to respect API
+        rate limits.
+        
+        Args:
+            commands: Natural language command strings
+            
+        Returns:
+            ParsedCommand objects in the order of the commands
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PARSES)
+        
+        async def parse_one(command: str) -> ParsedCommand:
+            async with semaphore:
+                return await asyncio.to_thread(self.parse_command, command)
+        
+        return list(await asyncio.gather(*(parse_one(command) for command in commands)))
+    
+    def _persistent_key(self, command: str) -> str:
+        """Persistent cache key: model, prompt version and normalized command"""
+        digest = hashlib.sha256(command.strip().lower().encode()).hexdigest()
+        return f"{self.model}:{_PROMPT_HASH}:{digest}"
+    
+    def _load_persisted(self, command: str) -> Optional[ParsedCommand]:
+        """Load LLM result persisted by an earlier run
+        
+        Args:
+            command: Natural language command string
+            
+        Returns:
+            ParsedCommand for this command or None
+        """
+        if self._disk_cache is None:
+            return None
+        
+        try:
+            data = self._disk_cache.get(self._persistent_key(command))
+            if data is None:
+                return None
+            
+            data = dict(data)
+            data["control_commands"] = [ControlCommand(**cmd) for cmd in data["control_commands"]]
+            data["original_command"] = command
+            data["cached_tokens"] = 0
+            return ParsedCommand(**data)
+        except Exception as e:
+            self.logger.warning("Parse cache read error: %s", e)
+            return None
+    
+    def _persist(self, command: str, parsed_command: ParsedCommand):
+        """Persist LLM result for later runs
+        
+        Args:
+            command: Natural language command string
+            parsed_command: ParsedCommand returned by the LLM
+        """
+        if self._disk_cache is None:
+            return
+        
+        try:
+            self._disk_cache.set(
+                self._persistent_key(command),
+                asdict(parsed_command),
+                expire=self.PERSISTENT_CACHE_TTL
+            )
+        except Exception as e:
+            self.logger.warning("Parse cache write error: %s", e)
+    
+    def _embed_command(self, command: str) -> Optional["np.ndarray"]:
+        """Embed command for the semantic cache
+        
+        Args:
+            command: Natural language command string
+            
+        Returns:
+            Unit-length embedding vector, or None if the request failed
+        """
+        try:
+            response = self.client.embeddings.create(model=self.EMBEDDING_MODEL, input=command)
+        except Exception as e:
+            self.logger.warning("Embedding error: %s", e)
+            return None
+        
+        import numpy as np
+        
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+    
+    @staticmethod
+    def _semantic_key(command: str) -> Tuple:
+        """Features a semantic cache hit must match exactly
+        
+        Args:
+            command: Natural language command string
+            
+        Returns:
+            (numbers, directions, value modes, negated, targets) of the command
+        """
+        command_lower = command.lower()
+        numbers = tuple(_NUMBER_RE.findall(command_lower))
+        directions = frozenset(
+            direction for direction, pattern in _DIRECTION_PATTERNS if pattern.search(command_lower)
+        )
+        value_modes = frozenset(
+            mode for mode, pattern in _VALUE_MODE_PATTERNS if pattern.search(command_lower)
+        )
+        negated = _NEGATION_RE.search(command_lower) is not None
+        targets = frozenset(_TARGET_RE.findall(command_lower))
+        return numbers, directions, value_modes, negated, targets
+    
+    def _semantic_lookup(self, command: str, embedding: "np.ndarray") -> Optional[ParsedCommand]:
+        """Find a cached LLM result for a semantically equivalent command
+        
+        Only commands with the same numbers, direction words, to/by
+        wording, negation and targets are compared, since embeddings barely
+        separate "10 keV" from "12 keV", "increase" from "decrease" or
+        "set to 10" from "raise by 10".
+        
+        Args:
+            command: Natural language command string
+            embedding: Unit-length embedding of the command
+            
+        Returns:
+            Cached ParsedCommand for this command or None
+        """
+        semantic_key = self._semantic_key(command)
+        best_key, best_similarity = None, self.SEMANTIC_SIMILARITY
+        with self._semantic_lock:
+            for key, (cached_key, vector, _) in self._semantic_cache.items():
+                if cached_key != semantic_key:
+                    continue
+                similarity = float(vector @ embedding)
+                if similarity >= best_similarity:
+                    best_key, best_similarity = key, similarity
+            
+            if best_key is None:
+                return None
+            
+            self._semantic_cache.move_to_end(best_key)
+            cached = self._semantic_cache[best_key][2]
+        return replace(cached, original_command=command)
+    
+    def _semantic_store(self, command: str, embedding: "np.ndarray", parsed_command: ParsedCommand):
+        """Store LLM result in the semantic cache
+        
+        Args:
+            command: Natural language command string
+            embedding: Unit-length embedding of the command
+            parsed_command: ParsedCommand returned by the LLM
+        """
+        semantic_key = self._semantic_key(command)
+        with self._semantic_lock:
+            self._semantic_cache[command] = (semantic_key, embedding, parsed_command)
+            self._semantic_cache.move_to_end(command)
+            if len(self._semantic_cache) > self.SEMANTIC_CACHE_SIZE:
+                self._semantic_cache.popitem(last=False)
     
     def _demo_parse_command(self, command: str) -> ParsedCommand:
         """Demo mode simple rule-based parsing
@@ -136,19 +614,14 @@ class CommandParser:
         """
         
         # Extract temperature-related keywords and numbers
-        temp_patterns = [
-            r'(?:temperature|temp|온도).*?(\d+(?:\.\d+)?)\s*(?:keV|kev|도)',
-            r'(\d+(?:\.\d+)?)\s*(?:keV|kev|도)',
-            r'(?:to|올려|낮춰|설정).*?(\d+(?:\.\d+)?)',
-            r'(\d+(?:\.\d+)?)'
-        ]
-        
+        command_lower = command.lower()
         target_temp = None
-        for pattern in temp_patterns:
-            matches = re.findall(pattern, command.lower())
-            if matches:
-                target_temp = float(matches[0])
-                break
+        if _NUMBER_RE.search(command_lower):  # every pattern needs a number
+            for pattern in _DEMO_TEMP_PATTERNS:
+                match = pattern.search(command_lower)
+                if match:
+                    target_temp = float(match.group(1))
+                    break
         
         # Set default value if no temperature found
         if not target_temp:
@@ -168,19 +641,15 @@ class CommandParser:
             target_value=target_temp,
             duration=5.0,
             control_commands=[
-                ControlCommand(
-                    pv_name="KSTAR:COIL:CURR",
+                replace(
+                    _COIL_TEMPLATE,
                     value=coil_current,
-                    unit="A",
-                    description=f"Temperature control via coil current for {target_temp} keV",
-                    priority=1
+                    description=f"{_COIL_TEMPLATE.description} for {target_temp} keV"
                 ),
-                ControlCommand(
-                    pv_name="KSTAR:HEATER:POW",
+                replace(
+                    _HEATER_TEMPLATE,
                     value=heater_power,
-                    unit="%",
-                    description=f"Temperature control via heater power for {target_temp} keV",
-                    priority=1
+                    description=f"{_HEATER_TEMPLATE.description} for {target_temp} keV"
                 )
             ],
             safety_checks=["demo_mode_safety_check"],
@@ -197,34 +666,30 @@ class CommandParser:
             ParsedCommand if pattern matches, None otherwise
         """
         
-        # Temperature control patterns
-        temp_patterns = [
-            r'온도를?\s*(\d+(?:\.\d+)?)\s*(?:keV|도|도씨)?\s*(?:로|으로)?\s*(?:올려|높여|증가)',
-            r'온도를?\s*(\d+(?:\.\d+)?)\s*(?:keV|도|도씨)?\s*(?:로|으로)?\s*(?:내려|낮춰|감소)',
-            r'온도를?\s*(\d+(?:\.\d+)?)\s*(?:keV|도|도씨)?\s*(?:로|으로)?\s*(?:설정|조절)',
-            r'온도를?\s*(\d+(?:\.\d+)?)\s*(?:keV|도|도씨)?\s*(?:로|으로)?\s*(?:유지)'
-        ]
+        # Keyword pre-check: the pattern only matches Korean temperature commands
+        if "온도" not in command:
+            return None
         
-        for pattern in temp_patterns:
-            match = re.search(pattern, command)
-            if match:
-                target_temp = float(match.group(1))
-                duration = self._extract_duration(command)
-                
-                # Generate temperature control commands
-                control_commands = self._generate_temperature_commands(target_temp)
-                
-                return ParsedCommand(
-                    original_command=command,
-                    intent="temperature_control",
-                    target_value=target_temp,
-                    duration=duration,
-                    control_commands=control_commands,
-                    safety_checks=["temperature_range", "heating_power_limit"],
-                    estimated_time=duration or 10.0
-                )
+        # Temperature control pattern
+        match = _QUICK_TEMP_RE.search(command)
+        if not match:
+            return None
         
-        return None
+        target_temp = float(match.group(1))
+        duration = self._extract_duration(command)
+        
+        # Generate temperature control commands
+        control_commands = self._generate_temperature_commands(target_temp)
+        
+        return ParsedCommand(
+            original_command=command,
+            intent="temperature_control",
+            target_value=target_temp,
+            duration=duration,
+            control_commands=control_commands,
+            safety_checks=["temperature_range", "heating_power_limit"],
+            estimated_time=duration or 10.0
+        )
     
     def _llm_parse(self, command: str) -> ParsedCommand:
         """Advanced command parsing using LLM
@@ -236,71 +701,51 @@ class CommandParser:
             ParsedCommand object with LLM-generated control instructions
         """
         
-        system_prompt = """
-You are an expert in KSTAR plasma control systems.
-Analyze natural language commands and convert them to EPICS control commands.
-
-Available control devices:
-- Coil current (COIL:CURR): 0-2000A, used for temperature control
-- Heater power (HEATER:POW): 0-100%, used for temperature control
-- Gas injection (GAS:FLOW): 0-1000sccm, used for density control
-- Magnetic field (MAGNET:BT): 0-3.5T, used for plasma stabilization
-
-Response format:
-{
-    "intent": "temperature_control|density_control|heating_control|combined_control",
-    "target_value": numeric_value,
-    "duration": time_in_seconds,
-    "control_commands": [
-        {
-            "pv_name": "PV_name",
-            "value": numeric_value,
-            "unit": "unit",
-            "description": "description",
-            "priority": 1
-        }
-    ],
-    "safety_checks": ["check1", "check2"],
-    "estimated_time": estimated_execution_time
-}
-"""
-        
         try:
-            response = self.client.chat.completions.create(
+            response = self.client.chat.completions.parse(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": f"Please analyze this command: {command}"}
                 ],
+                response_format=ParsedCommandSchema,
                 temperature=0.1
             )
             
-            result = json.loads(response.choices[0].message.content)
+            message = response.choices[0].message
+            result = message.parsed
+            if result is None:
+                raise ValueError(message.refusal or "Empty LLM response")
+            
+            # Prompt cache hits are reported per response (0 when not cached)
+            details = getattr(response.usage, "prompt_tokens_details", None)
+            cached_tokens = getattr(details, "cached_tokens", 0) or 0
             
             # Convert to ControlCommand objects
             control_commands = [
                 ControlCommand(
-                    pv_name=cmd["pv_name"],
-                    value=cmd["value"],
-                    unit=cmd["unit"],
-                    description=cmd["description"],
-                    priority=cmd.get("priority", 1)
+                    pv_name=cmd.pv_name,
+                    value=cmd.value,
+                    unit=cmd.unit,
+                    description=cmd.description,
+                    priority=cmd.priority
                 )
-                for cmd in result["control_commands"]
+                for cmd in result.control_commands
             ]
             
             return ParsedCommand(
                 original_command=command,
-                intent=result["intent"],
-                target_value=result.get("target_value"),
-                duration=result.get("duration"),
+                intent=result.intent,
+                target_value=result.target_value,
+                duration=result.duration,
                 control_commands=control_commands,
-                safety_checks=result.get("safety_checks", []),
-                estimated_time=result.get("estimated_time", 10.0)
+                safety_checks=result.safety_checks,
+                estimated_time=result.estimated_time,
+                cached_tokens=cached_tokens
             )
             
         except Exception as e:
-            print(f"LLM parsing error: {e}")
+            self.logger.warning("LLM parsing error: %s", e)
             # Fallback to basic parsing
             return self._create_fallback_command(command)
     
@@ -313,22 +758,10 @@ Response format:
         Returns:
             Duration in seconds or None if not found
         """
-        duration_patterns = [
-            r'(\d+)\s*초\s*(?:동안|간)',
-            r'(\d+)\s*분\s*(?:동안|간)',
-            r'(\d+)\s*시간\s*(?:동안|간)'
-        ]
-        
-        for pattern in duration_patterns:
-            match = re.search(pattern, command)
+        for pattern, multiplier in _DURATION_PATTERNS:
+            match = pattern.search(command)
             if match:
-                value = float(match.group(1))
-                if '분' in pattern:
-                    return value * 60
-                elif '시간' in pattern:
-                    return value * 3600
-                else:
-                    return value
+                return float(match.group(1)) * multiplier
         
         return None
     
@@ -341,55 +774,23 @@ Response format:
         Returns:
             List of ControlCommand objects
         """
-        commands = []
-        
         # Assume current temperature (should read from EPICS in practice)
         current_temp = 8.0  # keV
         
-        if target_temp > current_temp:
-            # Temperature increase: increase coil current and heater power
-            temp_diff = target_temp - current_temp
-            
-            # Calculate coil current (empirical formula)
-            coil_current = min(1500 + temp_diff * 100, 2000)
-            commands.append(ControlCommand(
-                pv_name="KSTAR:COIL:CURR",
-                value=coil_current,
-                unit="A",
-                description=f"Temperature control via coil current for {target_temp} keV",
-                priority=1
-            ))
-            
-            # Calculate heater power
-            heater_power = min(70 + temp_diff * 5, 100)
-            commands.append(ControlCommand(
-                pv_name="KSTAR:HEATER:POW",
-                value=heater_power,
-                unit="%",
-                description=f"Temperature control via heater power for {target_temp} keV",
-                priority=1
-            ))
+        temp_diff = target_temp - current_temp
+        if temp_diff == 0:
+            return []
         
-        elif target_temp < current_temp:
-            # Temperature decrease: decrease coil current and heater power
-            temp_diff = current_temp - target_temp
-            
-            coil_current = max(1000 - temp_diff * 50, 500)
-            commands.append(ControlCommand(
-                pv_name="KSTAR:COIL:CURR",
-                value=coil_current,
-                unit="A",
-                description=f"Temperature control via coil current reduction for {target_temp} keV",
-                priority=1
-            ))
-            
-            heater_power = max(30 - temp_diff * 3, 10)
-            commands.append(ControlCommand(
-                pv_name="KSTAR:HEATER:POW",
-                value=heater_power,
-                unit="%",
-                description=f"Temperature control via heater power reduction for {target_temp} keV",
-                priority=1
+        # Increase raises, decrease lowers coil current and heater power
+        increase = temp_diff > 0
+        
+        commands = []
+        for rise, fall, low, high in _TEMP_CONTROL_FORMULAS:
+            template, (base, slope) = rise if increase else fall
+            commands.append(replace(
+                template,
+                value=min(max(base + temp_diff * slope, low), high),
+                description=f"{template.description} for {target_temp} keV"
             ))
         
         return commands
@@ -414,6 +815,12 @@ Response format:
         )
 
 
+@functools.lru_cache(maxsize=1)
+def get_parser() -> CommandParser:
+    """Return the process-wide shared CommandParser instance"""
+    return CommandParser()
+
+
 # Test function
 def test_command_parser():
     """Test command parser functionality"""
@@ -437,5 +844,39 @@ def test_command_parser():
             print(f"  - {cmd_obj.pv_name} = {cmd_obj.value} {cmd_obj.unit}")
 
 
+def test_semantic_cache():
+    """Test that the semantic cache does not mix up opposite commands"""
+    import numpy as np
+    
+    parser = CommandParser()
+    
+    # Identical embeddings: only the semantic key can tell the commands apart
+    embedding = np.ones(8, dtype=np.float32) / np.sqrt(8)
+    stored = "Increase heater power by 10"
+    parser._semantic_store(stored, embedding, ParsedCommand(
+        original_command=stored,
+        intent="heating_control",
+        target_value=10.0,
+        duration=None,
+        control_commands=[replace(_HEATER_TEMPLATE, value=10.0)],
+        safety_checks=[],
+        estimated_time=1.0
+    ))
+    
+    cases = [
+        ("Raise heater power by 10", True),
+        ("Decrease heater power by 10", False),
+        ("Don't increase heater power by 10", False),
+        ("Increase heater power to 10", False),
+        ("Increase coil current by 10", False),
+        ("Increase heater power by 12", False)
+    ]
+    for command, expect_hit in cases:
+        hit = parser._semantic_lookup(command, embedding) is not None
+        print(f"{command}: {'hit' if hit else 'miss'}")
+        assert hit == expect_hit, f"semantic cache {'missed' if expect_hit else 'hit'} for {command!r}"
+
+
 if __name__ == "__main__":
     test_command_parser()
+    test_semantic_cache()
@@ -18,41 +18,130 @@ of plasma parameters, with plans for future integration with sophisticated model
 """
 
 import asyncio
-import json
-import random
+import gzip
+import logging
+import queue
+import re
 import time
-from typing import Dict, List, Optional, Any
+from collections import deque
+from contextlib import asynccontextmanager
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Dict, List, Optional, Any, Set
 from datetime import datetime
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi.responses import HTMLResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import uvicorn
+import orjson
 
-from ..core.execution_engine import CommandExecutionEngine, CommandExecution, ExecutionStatus
-from ..epics.controller import EPICSController
+from ..core.execution_engine import CommandExecutionEngine
+
+# Virtual PV names used by the demo simulation
+_SP_KEY = "KSTAR:PCS:TE:SP"
+_RBV_KEY = "KSTAR:PCS:TE:RBV"
+_COIL_KEY = "KSTAR:COIL:CURR"
+_HEATER_KEY = "KSTAR:HEATER:POW"
+
+
+def _tail(items: deque, count: int) -> List[Any]:
+    """Return the last count items of a deque as a list (walks only those items)"""
+    tail = list(islice(reversed(items), count))
+    tail.reverse()
+    return tail
 
 
 class ConnectionManager:
     """WebSocket connection manager for real-time communication"""
     
+    # Per-client send deadline (seconds); slower clients are dropped
+    SEND_TIMEOUT = 0.25
+    # Close code 1013 "Try Again Later" for dropped slow clients
+    SLOW_CLIENT_CLOSE_CODE = 1013
+    
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
+        # Broadcasts held back while a new connection receives its initial state
+        self._backlogs: Dict[WebSocket, deque] = {}
     
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket,
+                      build_initial_message: Optional[Callable[[], bytes]] = None):
+        """Accept a connection and send it the initial state
+        
+        Args:
+            websocket: Client connection
+            build_initial_message: Serializes the current state; called after
+                the handshake, once the connection is registered
+        """
         await websocket.accept()
-        self.active_connections.append(websocket)
+        if build_initial_message is None:
+            self.active_connections.add(websocket)
+            return
+        
+        # Register and take the snapshot without an await in between, so every
+        # update is either in the snapshot or broadcast afterwards. Those
+        # broadcasts queue up until the snapshot has gone out, then follow in order
+        backlog = self._backlogs[websocket] = deque()
+        self.active_connections.add(websocket)
+        initial_message = build_initial_message()
+        try:
+            await websocket.send_bytes(initial_message)
+            while backlog:
+                await asyncio.wait_for(websocket.send_bytes(backlog.popleft()), self.SEND_TIMEOUT)
+        except asyncio.TimeoutError:
+            # Same treatment as a slow client during broadcast
+            self.disconnect(websocket)
+            try:
+                await asyncio.wait_for(
+                    websocket.close(code=self.SLOW_CLIENT_CLOSE_CODE), self.SEND_TIMEOUT
+                )
+            except Exception:
+                pass
+        except BaseException:
+            self.disconnect(websocket)
+            raise
+        finally:
+            self._backlogs.pop(websocket, None)
     
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
+        self._backlogs.pop(websocket, None)
     
-    async def broadcast(self, message: str):
+    async def broadcast(self, message: bytes):
+        # Send the serialized JSON to all connections concurrently (binary frames,
+        # no str round trip); each send is bounded by SEND_TIMEOUT so a slow
+        # client cannot hold up the broadcast
+        connections = []
         for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except:
-                if connection in self.active_connections:
-                    self.active_connections.remove(connection)
+            backlog = self._backlogs.get(connection)
+            if backlog is not None:
+                backlog.append(message)
+            else:
+                connections.append(connection)
+        if not connections:
+            return
+        
+        results = await asyncio.gather(
+            *(asyncio.wait_for(connection.send_bytes(message), self.SEND_TIMEOUT)
+              for connection in connections),
+            return_exceptions=True
+        )
+        slow_connections = []
+        for connection, result in zip(connections, results):
+            if isinstance(result, BaseException):
+                self.disconnect(connection)
+                if isinstance(result, asyncio.TimeoutError):
+                    slow_connections.append(connection)
+        
+        # Close dropped slow clients so their endpoint loops exit
+        if slow_connections:
+            await asyncio.gather(
+                *(asyncio.wait_for(
+                    connection.close(code=self.SLOW_CLIENT_CLOSE_CODE), self.SEND_TIMEOUT
+                ) for connection in slow_connections),
+                return_exceptions=True
+            )
 
 
 class DemoModeUI:
@@ -63,33 +152,56 @@ class DemoModeUI:
     to EPICS command translation process and provides realistic parameter monitoring.
     """
     
+    # Simulation/broadcast period (seconds)
+    PUBLISH_INTERVAL = 0.5
+    
+    # Temperature-related keywords and number extraction (applied in order)
+    _TEMP_PATTERNS = tuple(re.compile(p) for p in (
+        r'(?:temperature|temp|온도).*?(\d+(?:\.\d+)?)\s*(?:keV|kev|도)',
+        r'(\d+(?:\.\d+)?)\s*(?:keV|kev|도)',
+        r'(?:to|올려|낮춰|설정).*?(\d+(?:\.\d+)?)',
+        r'(\d+(?:\.\d+)?)'
+    ))
+    
     def __init__(self):
-        self.app = FastAPI(title="KSTAR MCP PoC v2 - Demo Mode")
+        self.logger = logging.getLogger(__name__)
+        self.app = FastAPI(title="KSTAR MCP PoC v2 - Demo Mode", lifespan=self._lifespan)
         self.app.add_middleware(
             CORSMiddleware,
             allow_origins=["*"],
             allow_methods=["*"],
             allow_headers=["*"]
         )
+        # Compress HTTP responses (the demo page, status JSON)
+        self.app.add_middleware(GZipMiddleware, minimum_size=512)
         
         self.connection_manager = ConnectionManager()
         self.execution_engine = CommandExecutionEngine()
         
         # Demo mode virtual PV values (simulated KSTAR parameters)
         self.demo_values = {
-            "KSTAR:PCS:TE:SP": 8.0,    # Temperature setpoint (keV)
-            "KSTAR:PCS:TE:RBV": 8.0,   # Temperature readback value (keV)
-            "KSTAR:COIL:CURR": 1200.0, # Coil current (A)
-            "KSTAR:HEATER:POW": 50.0   # Heater power (%)
+            _SP_KEY: 8.0,       # Temperature setpoint (keV)
+            _RBV_KEY: 8.0,      # Temperature readback value (keV)
+            _COIL_KEY: 1200.0,  # Coil current (A)
+            _HEATER_KEY: 50.0   # Heater power (%)
+        }
+        
+        # /system/status view of demo_values, updated in place by _set_demo_value
+        self._pv_status_view = {
+            pv: {"value": value, "connected": True}
+            for pv, value in self.demo_values.items()
         }
         
-        # Continuous monitoring data for real-time updates
+        # Continuous monitoring data for real-time updates (bounded ring buffers)
         self.continuous_monitoring = {
-            "temperature_history": [],
-            "command_history": [],
+            "temperature_history": deque(maxlen=200),
+            "command_history": deque(maxlen=500),
             "last_update": None
         }
         
+        # Points sent with every continuous update (latest 50)
+        self._recent_temperatures = deque(maxlen=50)
+        
         self._setup_routes()
         self._setup_websocket_handlers()
     
@@ -97,8 +209,15 @@ class DemoModeUI:
         """Setup FastAPI routes for web interface"""
         
         @self.app.get("/", response_class=HTMLResponse)
-        async def get_ui():
-            return self._get_demo_html_ui()
+        async def get_ui(request: Request):
+            # The page is compressed once at import; GZipMiddleware leaves
+            # responses that already carry Content-Encoding alone
+            if "gzip" in request.headers.get("accept-encoding", ""):
+                return HTMLResponse(_DEMO_HTML_GZIP, headers={
+                    "Content-Encoding": "gzip",
+                    "Vary": "Accept-Encoding"
+                })
+            return HTMLResponse(_DEMO_HTML_BYTES)
         
         @self.app.post("/command")
         async def execute_command(request: dict):
@@ -120,10 +239,11 @@ class DemoModeUI:
             self.continuous_monitoring["command_history"].append(command_record)
             
             # Broadcast command execution via WebSocket
-            await self.connection_manager.broadcast(json.dumps({
-                "type": "command_executed",
-                "command_record": command_record
-            }))
+            if self.connection_manager.active_connections:
+                await self.connection_manager.broadcast(orjson.dumps({
+                    "type": "command_executed",
+                    "command_record": command_record
+                }))
             
             return {
                 "execution_id": f"demo_{int(time.time())}",
@@ -134,83 +254,145 @@ class DemoModeUI:
         @self.app.get("/monitoring/status")
         async def get_monitoring_status():
             return {
-                "temperature_history": self.continuous_monitoring["temperature_history"][-100:],
-                "command_history": self.continuous_monitoring["command_history"][-10:],
+                "temperature_history": _tail(self.continuous_monitoring["temperature_history"], 100),
+                "command_history": _tail(self.continuous_monitoring["command_history"], 10),
                 "last_update": self.continuous_monitoring["last_update"]
             }
         
         @self.app.get("/system/status")
         async def get_system_status():
-            return {
-                "epics_available": False,
-                "demo_mode": True,
-                "pv_status": {
-                    pv: {"value": value, "connected": True}
-                    for pv, value in self.demo_values.items()
-                }
-            }
+            return Response(
+                orjson.dumps({
+                    "epics_available": False,
+                    "demo_mode": True,
+                    "pv_status": self._pv_status_view
+                }),
+                media_type="application/json"
+            )
     
     def _setup_websocket_handlers(self):
         """Setup WebSocket handlers for real-time communication"""
         
         @self.app.websocket("/ws")
         async def websocket_endpoint(websocket: WebSocket):
-            await self.connection_manager.connect(websocket)
+            # New clients get the recent history once; later updates carry one sample
+            await self.connection_manager.connect(websocket, lambda: orjson.dumps({
+                "type": "continuous_snapshot",
+                "temperature_data": list(self._recent_temperatures),
+                "current_status": self.demo_values,
+                "timestamp": self.continuous_monitoring["last_update"]
+            }))
             
+            # Updates are pushed by the shared publisher task; just wait for disconnect
             try:
                 while True:
-                    # Continuous temperature monitoring (demo mode)
-                    await self._update_demo_monitoring()
-                    
-                    # Send real-time data via WebSocket
-                    await self.connection_manager.broadcast(json.dumps({
-                        "type": "continuous_update",
-                        "temperature_data": self.continuous_monitoring["temperature_history"][-50:],
-                        "current_status": self.demo_values,
-                        "timestamp": datetime.now().isoformat()
-                    }))
-                    
-                    await asyncio.sleep(0.5)  # Update every 0.5 seconds
-                    
+                    message = await websocket.receive()
+                    if message["type"] == "websocket.disconnect":
+                        break
             except WebSocketDisconnect:
+                pass
+            finally:
                 self.connection_manager.disconnect(websocket)
     
-    async def _update_demo_monitoring(self):
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI):
+        """Run the monitoring publisher for the lifetime of the app and
+        stop the execution engine's background tasks on shutdown"""
+        publisher = asyncio.create_task(self._publisher_loop())
+        try:
+            yield
+        finally:
+            publisher.cancel()
+            await self.execution_engine.shutdown()
+    
+    async def _publisher_loop(self):
+        """Advance the demo simulation and broadcast it to all clients
+        
+        A single task serves every WebSocket connection, so the simulation
+        advances at the same rate regardless of the number of clients.
+        Ticks are scheduled against a monotonic deadline so the period does
+        not stretch by the time spent updating and broadcasting.
+        """
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            # Continuous temperature monitoring (demo mode)
+            temp_record = await self._update_demo_monitoring()
+            
+            # Send only the new sample via WebSocket (clients keep their own history)
+            if self.connection_manager.active_connections:
+                await self.connection_manager.broadcast(orjson.dumps({
+                    "type": "continuous_update",
+                    "sample": temp_record,
+                    "current_status": self.demo_values,
+                    "timestamp": self.continuous_monitoring["last_update"]
+                }))
+            
+            # Sleep until the next deadline; if behind, skip missed ticks instead of catching up
+            next_tick += self.PUBLISH_INTERVAL
+            delay = next_tick - loop.time()
+            if delay < 0:
+                next_tick = loop.time()
+                delay = 0.0
+            await asyncio.sleep(delay)
+    
+    async def _update_demo_monitoring(self) -> Optional[Dict[str, Any]]:
         """Update demo monitoring data with realistic temperature changes
         
         This simulates how plasma temperature gradually approaches target values,
         providing a realistic demonstration of the control system behavior.
+        
+        Returns:
+            New temperature record, or None if the update failed
         """
         try:
+            now_iso = datetime.now().isoformat()  # one timestamp per tick
+            
             # Simulate gradual temperature approach to target
-            target_temp = self.demo_values["KSTAR:PCS:TE:SP"]
-            current_temp = self.demo_values["KSTAR:PCS:TE:RBV"]
+            dv = self.demo_values
+            sp = dv[_SP_KEY]
+            rbv = dv[_RBV_KEY]
             
             # Gradually approach target temperature if difference exists
-            if abs(target_temp - current_temp) > 0.01:
-                diff = target_temp - current_temp
+            diff = sp - rbv
+            if abs(diff) > 0.01:
                 # Move 5% of difference every 0.5 seconds (realistic behavior)
-                self.demo_values["KSTAR:PCS:TE:RBV"] += diff * 0.05
+                rbv += diff * 0.05
+                self._set_demo_value(_RBV_KEY, rbv)
             
             # Add temperature record to history
             temp_record = {
-                "timestamp": datetime.now().isoformat(),
-                "sp": self.demo_values["KSTAR:PCS:TE:SP"],
-                "rbv": self.demo_values["KSTAR:PCS:TE:RBV"],
-                "coil_current": self.demo_values["KSTAR:COIL:CURR"],
-                "heater_power": self.demo_values["KSTAR:HEATER:POW"]
+                "timestamp": now_iso,
+                "sp": sp,
+                "rbv": rbv,
+                "coil_current": dv[_COIL_KEY],
+                "heater_power": dv[_HEATER_KEY]
             }
             
+            # History keeps the latest 200 data points (deque maxlen)
             self.continuous_monitoring["temperature_history"].append(temp_record)
+            self._recent_temperatures.append(temp_record)
             
-            # Keep maximum 200 data points for performance
-            if len(self.continuous_monitoring["temperature_history"]) > 200:
-                self.continuous_monitoring["temperature_history"] = self.continuous_monitoring["temperature_history"][-200:]
-            
-            self.continuous_monitoring["last_update"] = datetime.now().isoformat()
+            self.continuous_monitoring["last_update"] = now_iso
+            return temp_record
             
-        except Exception as e:
-            print(f"Demo monitoring update error: {e}")
+        except Exception:
+            self.logger.exception("Demo monitoring update error")
+            return None
+    
+    def _set_demo_value(self, pv_name: str, value: float):
+        """Update a demo PV value and its /system/status view entry
+        
+        Args:
+            pv_name: Virtual PV name
+            value: New PV value
+        """
+        self.demo_values[pv_name] = value
+        entry = self._pv_status_view.get(pv_name)
+        if entry is None:
+            self._pv_status_view[pv_name] = {"value": value, "connected": True}
+        else:
+            entry["value"] = value
     
     async def _simulate_command_execution(self, command: str) -> Dict[str, Any]:
         """Simulate command execution with improved parsing
@@ -220,21 +402,12 @@ class DemoModeUI:
         """
         
         # Extract numbers from command (improved parsing)
-        import re
-        
-        # Temperature-related keywords and number extraction
-        temp_patterns = [
-            r'(?:temperature|temp|온도).*?(\d+(?:\.\d+)?)\s*(?:keV|kev|도)',
-            r'(\d+(?:\.\d+)?)\s*(?:keV|kev|도)',
-            r'(?:to|올려|낮춰|설정).*?(\d+(?:\.\d+)?)',
-            r'(\d+(?:\.\d+)?)'
-        ]
-        
+        command_lower = command.lower()
         target_temp = None
-        for pattern in temp_patterns:
-            matches = re.findall(pattern, command.lower())
-            if matches:
-                target_temp = float(matches[0])
+        for pattern in self._TEMP_PATTERNS:
+            match = pattern.search(command_lower)
+            if match:
+                target_temp = float(match.group(1))
                 break
         
         # Set default value if no temperature found
@@ -255,13 +428,13 @@ class DemoModeUI:
             "duration": 5.0,
             "control_commands": [
                 {
-                    "pv_name": "KSTAR:COIL:CURR",
+                    "pv_name": _COIL_KEY,
                     "value": coil_current,
                     "unit": "A",
                     "description": f"Temperature control via coil current for {target_temp} keV"
                 },
                 {
-                    "pv_name": "KSTAR:HEATER:POW",
+                    "pv_name": _HEATER_KEY,
                     "value": heater_power,
                     "unit": "%",
                     "description": f"Temperature control via heater power for {target_temp} keV"
@@ -269,51 +442,22 @@ class DemoModeUI:
             ]
         }
         
-        # Simulate execution results (store previous values)
+        # Execute each command and record results (previous value -> new value)
         results = []
-        
-        # Store previous values before command execution
-        old_values = {
-            "KSTAR:COIL:CURR": self.demo_values.get("KSTAR:COIL:CURR", 0),
-            "KSTAR:HEATER:POW": self.demo_values.get("KSTAR:HEATER:POW", 0)
-        }
-        
-        # Set target temperature immediately (actual temperature follows gradually via WebSocket)
-        target_temp = parsed_command["target_value"]
-        if target_temp:
-            self.demo_values["KSTAR:PCS:TE:SP"] = target_temp
-            
-            # Calculate coil current and heater power based on temperature
-            base_current = 1200
-            base_power = 50
-            temp_diff = target_temp - 8.0  # Reference temperature 8keV
-            
-            self.demo_values["KSTAR:COIL:CURR"] = base_current + (temp_diff * 100)
-            self.demo_values["KSTAR:HEATER:POW"] = base_power + (temp_diff * 5)
-        
-        # Execute each command and record results
         for cmd in parsed_command["control_commands"]:
-            old_value = old_values[cmd["pv_name"]]
-            new_value = cmd["value"]
-            
             results.append({
                 "pv_name": cmd["pv_name"],
                 "value": cmd["value"],
                 "unit": cmd["unit"],
                 "success": True,
-                "old_value": old_value,
-                "new_value": new_value,
+                "old_value": self.demo_values.get(cmd["pv_name"], 0),
+                "new_value": cmd["value"],
                 "execution_time": 0.1
             })
+            self._set_demo_value(cmd["pv_name"], cmd["value"])
         
-        # Target temperature is set immediately, actual temperature follows gradually
-        target_temp = parsed_command["target_value"]
-        if target_temp:
-            # Set target temperature immediately
-            self.demo_values["KSTAR:PCS:TE:SP"] = target_temp
-            
-            # Actual temperature follows gradually (handled by WebSocket)
-            # Don't change immediately here
+        # Set target temperature immediately (actual temperature follows gradually via WebSocket)
+        self._set_demo_value(_SP_KEY, target_temp)
         
         return {
             "parsed_command": parsed_command,
@@ -326,7 +470,49 @@ class DemoModeUI:
         This method returns a complete HTML page with embedded CSS and JavaScript
         that provides a modern, responsive interface for the KSTAR control system.
         """
-        return """
+        return _DEMO_HTML
+    
+    def run(self, host: str = "0.0.0.0", port: int = 8000):
+        """Start the demo mode server
+        
+        Args:
+            host: Server host address
+            port: Server port number
+        """
+        print(f"🚀 KSTAR MCP PoC v2 Demo Mode Server Starting...")
+        print(f"🌐 Web UI: http://{host}:{port}")
+        print(f"📡 WebSocket: ws://{host}:{port}/ws")
+        print(f"🎬 Demo Mode: Simulation without EPICS connection")
+        
+        # Hand log records to a background thread so handler I/O never blocks the event loop
+        root_logger = logging.getLogger()
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, *root_logger.handlers, respect_handler_level=True)
+        root_logger.handlers = [QueueHandler(log_queue)]
+        listener.start()
+        
+        try:
+            # "auto" selects uvloop and httptools from uvicorn[standard] when available
+            # (uvloop is not available on Windows); per-request access logs are off;
+            # WebSocket frames use permessage-deflate when the browser supports it
+            uvicorn.run(
+                self.app,
+                host=host,
+                port=port,
+                loop="auto",
+                http="auto",
+                ws="websockets",
+                ws_per_message_deflate=True,
+                log_level="warning",
+                access_log=False
+            )
+        finally:
+            listener.stop()
+            root_logger.handlers = list(listener.handlers)
+
+
+# Demo page (static, served from pre-encoded bytes)
+_DEMO_HTML = """
 <!DOCTYPE html>
 <html lang="ko">
 <head>
@@ -515,7 +701,7 @@ class DemoModeUI:
         #temperatureChart {
             width: 100%;
             height: 400px;
-            background: rgba(0, 0, 0, 0.5);
+            background: #0d0d14;  /* 불투명 캔버스 배경 (CHART_BACKGROUND와 동일) */
             border-radius: 10px;
             border: 1px solid rgba(255, 255, 255, 0.1);
         }
@@ -756,12 +942,100 @@ class DemoModeUI:
             </div>
         </div>
     </div>
+    
+    <!-- 명령 변환/히스토리 항목 템플릿 (복제 후 textContent로 값만 채움) -->
+    <template id="stepTpl">
+        <div class="conversion-step fade-in">
+            <div class="step-header"></div>
+            <div class="step-content"></div>
+        </div>
+    </template>
+    <template id="interpretationTpl">
+        <div class="conversion-step fade-in">
+            <div class="step-header">2️⃣ LLM Interpretation</div>
+            <div class="step-content">
+                Intent: <span class="intent"></span><br>
+                Target Value: <span class="target-value"></span><br>
+                Duration: <span class="duration"></span> seconds
+            </div>
+        </div>
+    </template>
+    <template id="setCommandTpl">
+        <div class="conversion-step set-command fade-in">
+            <div class="step-header">3️⃣ EPICS SET Command</div>
+            <div class="step-content">
+                SET <span class="pv-name"></span> = 
+                <span class="pv-value"></span> 
+                <span class="pv-unit"></span><br>
+                <small class="pv-description"></small>
+            </div>
+        </div>
+    </template>
+    <template id="resultTpl">
+        <span class="pv-name"></span>: 
+        <span class="old-value"></span> → <span class="pv-value"></span> 
+        <span class="pv-unit"></span>
+        <span class="result-status"></span><br>
+    </template>
+    <template id="historyTpl">
+        <div class="history-item fade-in">
+            <div class="history-timestamp"></div>
+            <div class="history-command"></div>
+            <div class="history-result"></div>
+        </div>
+    </template>
 
     <script>
         let ws = null;
         let chart = null;
-        let temperatureData = [];
+        const MAX_CHART_POINTS = 50;
+        // 차트 데이터 링 버퍼 (최근 MAX_CHART_POINTS개, 가장 오래된 샘플을 덮어씀)
+        const temperatureData = new Array(MAX_CHART_POINTS);
+        let temperatureHead = 0;   // 다음 샘플을 쓸 위치
+        let temperatureCount = 0;
+        const MAX_HISTORY = 10;
+        // 불투명 차트 배경색 (패널 위 반투명 검정 배경을 합성한 색)
+        const CHART_BACKGROUND = '#0d0d14';
+        // 차트 시리즈 (데이터 필드, 색상) - 그리는 순서대로
+        const CHART_SERIES = [
+            {field: 'sp', color: '#2563eb'},
+            {field: 'rbv', color: '#f59e0b'},
+            {field: 'coil_current', color: '#8b5cf6'},
+            {field: 'heater_power', color: '#ef4444'}
+        ];
         let commandHistory = [];
+        const textDecoder = new TextDecoder();
+        let gridCache = null;
+        
+        // 다음 애니메이션 프레임에 한 번에 반영할 화면 변경
+        let renderPending = false;
+        let pendingStatus = null;
+        let pendingCommands = [];
+        let chartDirty = false;
+        let demoRunning = false;
+        let chartVisible = true;
+        
+        // DOM 요소/템플릿 참조 캐시 (스크립트가 body 끝에 있어 요소가 이미 존재)
+        const els = {
+            connectionStatus: document.getElementById('connectionStatus'),
+            currentTemp: document.getElementById('currentTemp'),
+            targetTemp: document.getElementById('targetTemp'),
+            coilCurrent: document.getElementById('coilCurrent'),
+            heaterPower: document.getElementById('heaterPower'),
+            conversion: document.getElementById('commandConversion'),
+            history: document.getElementById('commandHistory'),
+            chart: document.getElementById('temperatureChart'),
+            input: document.getElementById('commandInput')
+        };
+        const templates = {
+            step: document.getElementById('stepTpl').content.firstElementChild,
+            interpretation: document.getElementById('interpretationTpl').content.firstElementChild,
+            setCommand: document.getElementById('setCommandTpl').content.firstElementChild,
+            result: document.getElementById('resultTpl').content,
+            history: document.getElementById('historyTpl').content.firstElementChild
+        };
+        // 차트는 그리기 전용 불투명 캔버스 (알파 합성 생략)
+        const chartCtx = els.chart.getContext('2d', {alpha: false});
         
         // WebSocket 연결
         function connectWebSocket() {
@@ -769,6 +1043,7 @@ class DemoModeUI:
             const wsUrl = `${protocol}//${window.location.host}/ws`;
             
             ws = new WebSocket(wsUrl);
+            ws.binaryType = 'arraybuffer';
             
             ws.onopen = function() {
                 console.log('WebSocket connected');
@@ -776,7 +1051,8 @@ class DemoModeUI:
             };
             
             ws.onmessage = function(event) {
-                const data = JSON.parse(event.data);
+                // Server sends UTF-8 JSON as binary frames
+                const data = JSON.parse(textDecoder.decode(event.data));
                 handleWebSocketMessage(data);
             };
             
@@ -793,7 +1069,7 @@ class DemoModeUI:
         }
         
         function updateConnectionStatus(connected) {
-            const status = document.getElementById('connectionStatus');
+            const status = els.connectionStatus;
             if (connected) {
                 status.textContent = '🟢 Connected (Demo)';
                 status.className = 'connection-status connected';
@@ -805,6 +1081,9 @@ class DemoModeUI:
         
         function handleWebSocketMessage(data) {
             switch(data.type) {
+                case 'continuous_snapshot':
+                    loadContinuousSnapshot(data);
+                    break;
                 case 'continuous_update':
                     updateContinuousData(data);
                     break;
@@ -814,16 +1093,72 @@ class DemoModeUI:
             }
         }
         
+        function pushTemperature(sample) {
+            temperatureData[temperatureHead] = sample;
+            temperatureHead = (temperatureHead + 1) % MAX_CHART_POINTS;
+            if (temperatureCount < MAX_CHART_POINTS) temperatureCount++;
+        }
+        
+        function loadContinuousSnapshot(data) {
+            // 접속 시 최근 온도 데이터 전체 수신 (버퍼를 비우고 다시 채움)
+            temperatureHead = 0;
+            temperatureCount = 0;
+            data.temperature_data.slice(-MAX_CHART_POINTS).forEach(pushTemperature);
+            updateChart();
+            
+            if (data.current_status) {
+                pendingStatus = data.current_status;
+                scheduleRender();
+            }
+        }
+        
         function updateContinuousData(data) {
-            // 온도 데이터 업데이트
-            if (data.temperature_data) {
-                temperatureData = data.temperature_data;
+            // 온도 데이터 업데이트 (새 샘플만 수신, 최근 50개 유지)
+            if (data.sample) {
+                pushTemperature(data.sample);
                 updateChart();
             }
             
-            // 현재 상태 업데이트
+            // 현재 상태 업데이트 (프레임당 최신 값만 반영)
             if (data.current_status) {
-                updateCurrentStatus(data.current_status);
+                pendingStatus = data.current_status;
+                scheduleRender();
+            }
+        }
+        
+        function scheduleRender() {
+            if (renderPending) return;
+            renderPending = true;
+            requestAnimationFrame(renderFrame);
+        }
+        
+        function renderFrame() {
+            // 프레임 사이에 쌓인 WebSocket 변경을 한 번에 DOM/캔버스에 반영
+            renderPending = false;
+            
+            if (pendingStatus) {
+                updateCurrentStatus(pendingStatus);
+                pendingStatus = null;
+            }
+            
+            if (pendingCommands.length > 0) {
+                const commands = pendingCommands;
+                pendingCommands = [];
+                showCommandConversion(commands[commands.length - 1]);
+                commands.slice(-MAX_HISTORY).forEach(addToCommandHistory);
+            }
+            
+            // 차트가 화면에 보이지 않으면 다시 보일 때까지 그리기 보류
+            if (chartDirty && chartVisible && !document.hidden) {
+                chartDirty = false;
+                drawChart();
+            }
+        }
+        
+        function resumeChart() {
+            // 다시 보이게 되면 보류된 그리기 실행
+            if (chartDirty && chartVisible && !document.hidden) {
+                scheduleRender();
             }
         }
         
@@ -831,199 +1166,224 @@ class DemoModeUI:
             // 현재 온도
             const currentTemp = status['KSTAR:PCS:TE:RBV'];
             if (currentTemp !== null) {
-                document.getElementById('currentTemp').textContent = currentTemp.toFixed(2);
+                els.currentTemp.textContent = currentTemp.toFixed(2);
             }
             
             // 목표 온도
             const targetTemp = status['KSTAR:PCS:TE:SP'];
             if (targetTemp !== null) {
-                document.getElementById('targetTemp').textContent = targetTemp.toFixed(2);
+                els.targetTemp.textContent = targetTemp.toFixed(2);
             }
             
             // 코일 전류
             const coilCurrent = status['KSTAR:COIL:CURR'];
             if (coilCurrent !== null) {
-                document.getElementById('coilCurrent').textContent = coilCurrent.toFixed(1);
+                els.coilCurrent.textContent = coilCurrent.toFixed(1);
             }
             
             // 가열 파워
             const heaterPower = status['KSTAR:HEATER:POW'];
             if (heaterPower !== null) {
-                document.getElementById('heaterPower').textContent = heaterPower.toFixed(1);
+                els.heaterPower.textContent = heaterPower.toFixed(1);
             }
         }
         
         function handleCommandExecuted(commandRecord) {
-            // 명령 변환 과정 표시
-            showCommandConversion(commandRecord);
-            
-            // 명령 히스토리에 추가
-            addToCommandHistory(commandRecord);
+            // 다음 프레임에 명령 변환 과정 표시 및 히스토리 추가
+            pendingCommands.push(commandRecord);
+            scheduleRender();
         }
         
-        function showCommandConversion(commandRecord) {
-            const conversionDiv = document.getElementById('commandConversion');
-            
-            const conversionHtml = `
-                <div class="conversion-step fade-in">
-                    <div class="step-header">1️⃣ Natural Language Input</div>
-                    <div class="step-content">"${commandRecord.original_command}"</div>
-                </div>
-                
-                <div class="conversion-step fade-in">
-                    <div class="step-header">2️⃣ LLM Interpretation</div>
-                    <div class="step-content">
-                        Intent: ${commandRecord.parsed_command.intent}<br>
-                        Target Value: ${commandRecord.parsed_command.target_value || 'N/A'}<br>
-                        Duration: ${commandRecord.parsed_command.duration || 'N/A'} seconds
-                    </div>
-                </div>
-                
-                ${commandRecord.parsed_command.control_commands.map(cmd => `
-                    <div class="conversion-step set-command fade-in">
-                        <div class="step-header">3️⃣ EPICS SET Command</div>
-                        <div class="step-content">
-                            SET <span class="pv-name">${cmd.pv_name}</span> = 
-                            <span class="pv-value">${cmd.value}</span> 
-                            <span class="pv-unit">${cmd.unit}</span><br>
-                            <small>${cmd.description}</small>
-                        </div>
-                    </div>
-                `).join('')}
-                
-                <div class="conversion-step fade-in">
-                    <div class="step-header">4️⃣ Execution Results</div>
-                    <div class="step-content">
-                        ${commandRecord.results.map(result => `
-                            <span class="pv-name">${result.pv_name}</span>: 
-                            ${result.old_value} → <span class="pv-value">${result.new_value}</span> 
-                            <span class="pv-unit">${result.unit}</span>
-                            <span style="color: ${result.success ? '#22c55e' : '#ef4444'}">
-                                ${result.success ? '✅' : '❌'}
-                            </span><br>
-                        `).join('')}
-                    </div>
-                </div>
-            `;
-            
-            conversionDiv.innerHTML = conversionHtml;
+        function buildSetNode(cmd) {
+            const setStep = templates.setCommand.cloneNode(true);
+            setStep.querySelector('.pv-name').textContent = cmd.pv_name;
+            setStep.querySelector('.pv-value').textContent = cmd.value;
+            setStep.querySelector('.pv-unit').textContent = cmd.unit;
+            setStep.querySelector('.pv-description').textContent = cmd.description;
+            return setStep;
         }
         
-        function addToCommandHistory(commandRecord) {
-            const historyDiv = document.getElementById('commandHistory');
+        function buildResultNode(result) {
+            // 결과 한 줄 (여러 최상위 노드 → fragment로 복제)
+            const row = templates.result.cloneNode(true);
+            row.querySelector('.pv-name').textContent = result.pv_name;
+            row.querySelector('.old-value').textContent = result.old_value;
+            row.querySelector('.pv-value').textContent = result.new_value;
+            row.querySelector('.pv-unit').textContent = result.unit;
+            const status = row.querySelector('.result-status');
+            status.style.color = result.success ? '#22c55e' : '#ef4444';
+            status.textContent = result.success ? '✅' : '❌';
+            return row;
+        }
+        
+        function showCommandConversion(commandRecord) {
+            const conversionDiv = els.conversion;
+            const parsed = commandRecord.parsed_command;
+            const fragment = document.createDocumentFragment();
             
-            const historyItem = document.createElement('div');
-            historyItem.className = 'history-item fade-in';
+            const inputStep = templates.step.cloneNode(true);
+            inputStep.querySelector('.step-header').textContent = '1️⃣ Natural Language Input';
+            inputStep.querySelector('.step-content').textContent = `"${commandRecord.original_command}"`;
+            fragment.appendChild(inputStep);
             
-            const timestamp = new Date(commandRecord.timestamp).toLocaleTimeString();
+            const interpretationStep = templates.interpretation.cloneNode(true);
+            interpretationStep.querySelector('.intent').textContent = parsed.intent;
+            interpretationStep.querySelector('.target-value').textContent = parsed.target_value || 'N/A';
+            interpretationStep.querySelector('.duration').textContent = parsed.duration || 'N/A';
+            fragment.appendChild(interpretationStep);
             
-            historyItem.innerHTML = `
-                <div class="history-timestamp">${timestamp}</div>
-                <div class="history-command">"${commandRecord.original_command}"</div>
-                <div class="history-result">
-                    ${commandRecord.parsed_command.control_commands.map(cmd => 
-                        `SET ${cmd.pv_name} = ${cmd.value} ${cmd.unit}`
-                    ).join('<br>')}
-                </div>
-            `;
+            parsed.control_commands.forEach(cmd => fragment.appendChild(buildSetNode(cmd)));
             
-            historyDiv.insertBefore(historyItem, historyDiv.firstChild);
+            // 결과 행은 분리된 step 노드에 먼저 모은 뒤 fragment에 추가
+            const resultsStep = templates.step.cloneNode(true);
+            resultsStep.querySelector('.step-header').textContent = '4️⃣ Execution Results';
+            const resultsContent = resultsStep.querySelector('.step-content');
+            commandRecord.results.forEach(result => resultsContent.appendChild(buildResultNode(result)));
+            fragment.appendChild(resultsStep);
             
-            // 최대 10개 항목 유지
-            while (historyDiv.children.length > 10) {
-                historyDiv.removeChild(historyDiv.lastChild);
-            }
+            // 완성된 fragment로 한 번에 교체 (호출당 DOM 변경 1회)
+            conversionDiv.replaceChildren(fragment);
         }
         
-        function updateChart() {
-            const canvas = document.getElementById('temperatureChart');
-            if (!canvas) return;
-            
-            const ctx = canvas.getContext('2d');
-            const width = canvas.width = canvas.clientWidth;
-            const height = canvas.height = canvas.clientHeight;
+        function addToCommandHistory(commandRecord) {
+            const historyDiv = els.history;
             
-            // 배경 클리어
-            ctx.clearRect(0, 0, width, height);
+            const historyItem = templates.history.cloneNode(true);
+            historyItem.querySelector('.history-timestamp').textContent =
+                new Date(commandRecord.timestamp).toLocaleTimeString();
+            historyItem.querySelector('.history-command').textContent = `"${commandRecord.original_command}"`;
             
-            if (temperatureData.length < 2) return;
+            const resultDiv = historyItem.querySelector('.history-result');
+            commandRecord.parsed_command.control_commands.forEach((cmd, index) => {
+                if (index > 0) {
+                    resultDiv.appendChild(document.createElement('br'));
+                }
+                resultDiv.appendChild(document.createTextNode(`SET ${cmd.pv_name} = ${cmd.value} ${cmd.unit}`));
+            });
             
-            // 그리드 그리기
-            ctx.strokeStyle = 'rgba(255, 255, 255, 0.1)';
-            ctx.lineWidth = 1;
+            // 새 항목 + 기존 최근 항목으로 한 번에 교체 (최대 MAX_HISTORY개 유지)
+            const kept = Array.prototype.slice.call(historyDiv.children, 0, MAX_HISTORY - 1);
+            historyDiv.replaceChildren(historyItem, ...kept);
+        }
+        
+        function buildGridCache(width, height) {
+            // 그리드와 Y축 레이블은 크기가 바뀔 때만 오프스크린 캔버스에 다시 그림
+            if (typeof OffscreenCanvas !== 'undefined') {
+                gridCache = new OffscreenCanvas(width, height);
+            } else {
+                gridCache = document.createElement('canvas');
+                gridCache.width = width;
+                gridCache.height = height;
+            }
+            const g = gridCache.getContext('2d');
             
             // 수평 그리드
+            g.strokeStyle = 'rgba(255, 255, 255, 0.1)';
+            g.lineWidth = 1;
             for (let i = 0; i <= 6; i++) {
                 const y = (height / 6) * i;
-                ctx.beginPath();
-                ctx.moveTo(40, y);
-                ctx.lineTo(width - 20, y);
-                ctx.stroke();
+                g.beginPath();
+                g.moveTo(40, y);
+                g.lineTo(width - 20, y);
+                g.stroke();
             }
             
             // Y축 레이블
-            ctx.fillStyle = 'rgba(255, 255, 255, 0.7)';
-            ctx.font = '12px Arial';
-            ctx.textAlign = 'right';
+            g.fillStyle = 'rgba(255, 255, 255, 0.7)';
+            g.font = '12px Arial';
+            g.textAlign = 'right';
             for (let i = 0; i <= 6; i++) {
                 const value = 30 - (i * 5);
                 const y = (height / 6) * i + 5;
-                ctx.fillText(value.toString(), 35, y);
+                g.fillText(value.toString(), 35, y);
             }
+        }
+        
+        function resizeChart() {
+            // 표시 크기가 바뀐 경우에만 캔버스 버퍼 크기 변경 (대입 시 비트맵이 재할당됨)
+            const canvas = els.chart;
+            const cw = canvas.clientWidth;
+            const ch = canvas.clientHeight;
+            if (canvas.width !== cw) canvas.width = cw;
+            if (canvas.height !== ch) canvas.height = ch;
+            updateChart();
+        }
+        
+        function updateChart() {
+            // 같은 프레임 안의 여러 요청(데이터 수신, 리사이즈)을 한 번의 그리기로 합침
+            chartDirty = true;
+            scheduleRender();
+        }
+        
+        function drawChart() {
+            // 캔버스 크기는 resizeChart에서 맞춰 둠
+            const ctx = chartCtx;
+            const width = els.chart.width;
+            const height = els.chart.height;
             
-            // 좌표 변환 함수
-            const toX = (index) => 40 + (index / (temperatureData.length - 1)) * (width - 60);
-            const toY = (value) => height - 20 - ((value / 30) * (height - 40));
+            // 배경 칠하기 (불투명 캔버스)
+            ctx.fillStyle = CHART_BACKGROUND;
+            ctx.fillRect(0, 0, width, height);
             
-            // 데이터 포인트 그리기
-            const colors = {
-                sp: '#2563eb',
-                rbv: '#f59e0b',
-                coil: '#8b5cf6',
-                heater: '#ef4444'
-            };
+            if (temperatureCount < 2 || width === 0 || height === 0) return;
             
-            // 라인 그리기
-            ['sp', 'rbv', 'coil', 'heater'].forEach((key, keyIndex) => {
-                const points = [];
-                
-                temperatureData.forEach((point, index) => {
-                    let value = null;
-                    switch(key) {
-                        case 'sp': value = point.sp; break;
-                        case 'rbv': value = point.rbv; break;
-                        case 'coil': value = point.coil_current; break;
-                        case 'heater': value = point.heater_power; break;
-                    }
+            // 캐시된 그리드 복사
+            if (!gridCache || gridCache.width !== width || gridCache.height !== height) {
+                buildGridCache(width, height);
+            }
+            ctx.drawImage(gridCache, 0, 0);
+            
+            // 좌표 변환 상수 (x = xBase + index * xScale, y = yBase - value * yScale)
+            const xBase = 40;
+            const xScale = (width - 60) / (temperatureCount - 1);
+            const yBase = height - 20;
+            const yScale = (height - 40) / 30;
+            
+            // 데이터를 한 번만 순회하며 시리즈별 라인/포인트 경로 생성
+            const seriesCount = CHART_SERIES.length;
+            const lines = [];
+            const dots = [];
+            const started = [];
+            for (let k = 0; k < seriesCount; k++) {
+                lines.push(new Path2D());
+                dots.push(new Path2D());
+                started.push(false);
+            }
+            
+            // 가장 오래된 샘플부터 순서대로 순회
+            let slot = (temperatureHead - temperatureCount + MAX_CHART_POINTS) % MAX_CHART_POINTS;
+            for (let i = 0; i < temperatureCount; i++) {
+                const point = temperatureData[slot];
+                slot = slot + 1 === MAX_CHART_POINTS ? 0 : slot + 1;
+                const x = xBase + i * xScale;
+                for (let k = 0; k < seriesCount; k++) {
+                    const value = point[CHART_SERIES[k].field];
+                    if (value === null || value === undefined) continue;
                     
-                    if (value !== null) {
-                        points.push({x: toX(index), y: toY(value)});
+                    const y = yBase - value * yScale;
+                    if (started[k]) {
+                        lines[k].lineTo(x, y);
+                    } else {
+                        lines[k].moveTo(x, y);
+                        started[k] = true;
                     }
-                });
-                
-                if (points.length > 1) {
-                    ctx.strokeStyle = colors[key];
-                    ctx.lineWidth = 2;
-                    ctx.beginPath();
-                    points.forEach((point, index) => {
-                        if (index === 0) ctx.moveTo(point.x, point.y);
-                        else ctx.lineTo(point.x, point.y);
-                    });
-                    ctx.stroke();
+                    dots[k].moveTo(x + 2, y);
+                    dots[k].arc(x, y, 2, 0, 2 * Math.PI);
                 }
-                
-                // 데이터 포인트 그리기
-                ctx.fillStyle = colors[key];
-                points.forEach(point => {
-                    ctx.beginPath();
-                    ctx.arc(point.x, point.y, 2, 0, 2 * Math.PI);
-                    ctx.fill();
-                });
-            });
+            }
+            
+            // 시리즈별 라인과 데이터 포인트 그리기
+            ctx.lineWidth = 2;
+            for (let k = 0; k < seriesCount; k++) {
+                ctx.strokeStyle = CHART_SERIES[k].color;
+                ctx.stroke(lines[k]);
+                ctx.fillStyle = CHART_SERIES[k].color;
+                ctx.fill(dots[k]);
+            }
         }
         
         async function executeCommand() {
-            const input = document.getElementById('commandInput');
+            const input = els.input;
             const command = input.value.trim();
             
             if (!command) {
@@ -1050,7 +1410,11 @@ class DemoModeUI:
             }
         }
         
-        function startDemo() {
+        async function startDemo() {
+            // 실행 중인 데모가 있으면 무시 (명령이 중복으로 쌓이지 않도록)
+            if (demoRunning) return;
+            demoRunning = true;
+            
             const demoCommands = [
                 "Increase plasma temperature to 10 keV",
                 "Set temperature to 12 keV for 3 seconds",
@@ -1058,51 +1422,48 @@ class DemoModeUI:
                 "Lower temperature to 6 keV"
             ];
             
-            let index = 0;
-            const interval = setInterval(() => {
-                if (index < demoCommands.length) {
-                    document.getElementById('commandInput').value = demoCommands[index];
-                    executeCommand();
-                    index++;
-                } else {
-                    clearInterval(interval);
+            try {
+                // 각 명령의 응답을 받은 뒤 8초 대기 후 다음 명령 실행
+                for (const command of demoCommands) {
+                    els.input.value = command;
+                    await executeCommand();
+                    await new Promise(resolve => setTimeout(resolve, 8000));
                 }
-            }, 8000);
+            } finally {
+                demoRunning = false;
+            }
         }
         
-        // 키보드 이벤트
-        document.getElementById('commandInput').addEventListener('keypress', function(e) {
+        // 키보드 이벤트 (preventDefault를 호출하지 않으므로 passive)
+        els.input.addEventListener('keypress', function(e) {
             if (e.key === 'Enter') {
                 executeCommand();
             }
-        });
+        }, {passive: true});
         
         // 페이지 로드 시 초기화
         window.addEventListener('load', function() {
             connectWebSocket();
-            updateChart();
+            resizeChart();
         });
         
-        // 윈도우 리사이즈 시 차트 업데이트
-        window.addEventListener('resize', updateChart);
+        // 차트가 스크롤로 가려지거나 탭이 숨겨진 동안에는 그리지 않음
+        if (typeof IntersectionObserver !== 'undefined') {
+            new IntersectionObserver(([entry]) => {
+                chartVisible = entry.isIntersecting;
+                resumeChart();
+            }).observe(els.chart);
+        }
+        document.addEventListener('visibilitychange', resumeChart);
+        
+        // 윈도우 리사이즈 시 캔버스 크기 갱신 후 차트 업데이트
+        window.addEventListener('resize', resizeChart, {passive: true});
     </script>
 </body>
 </html>
         """
-    
-    def run(self, host: str = "0.0.0.0", port: int = 8000):
-        """Start the demo mode server
-        
-        Args:
-            host: Server host address
-            port: Server port number
-        """
-        print(f"🚀 KSTAR MCP PoC v2 Demo Mode Server Starting...")
-        print(f"🌐 Web UI: http://{host}:{port}")
-        print(f"📡 WebSocket: ws://{host}:{port}/ws")
-        print(f"🎬 Demo Mode: Simulation without EPICS connection")
-        
-        uvicorn.run(self.app, host=host, port=port, log_level="info")
+_DEMO_HTML_BYTES = _DEMO_HTML.encode("utf-8")
+_DEMO_HTML_GZIP = gzip.compress(_DEMO_HTML_BYTES, mtime=0)
 
 
 # Main execution function
@@ -18,41 +18,113 @@ is working correctly before using it for actual plasma control.
 """
 
 import asyncio
+import io
 import sys
+from contextvars import ContextVar
 from pathlib import Path
+from typing import Awaitable, Optional
 
 # Add project root to Python path for imports
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from src.llm.command_parser import CommandParser, test_command_parser
+from src.llm.command_parser import get_parser, test_command_parser, test_semantic_cache
 from src.epics.controller import EPICSController, test_epics_controller
-from src.core.execution_engine import CommandExecutionEngine, test_execution_engine
+from src.core.execution_engine import (
+    CommandExecutionEngine, test_execution_engine, test_execution_cancellation
+)
 
 
-async def test_full_system():
-    """Test the complete KSTAR MCP PoC v2 system
+# Output buffer of the test section running in the current task/thread
+_section_output: ContextVar[Optional[io.StringIO]] = ContextVar("_section_output", default=None)
+
+
+class _SectionStdout:
+    """sys.stdout proxy that writes to the current section's buffer, if any"""
     
-    This function runs comprehensive tests on all major components
-    to ensure the system is working correctly.
-    """
-    print("🧪 KSTAR MCP PoC v2 Full System Test")
-    print("=" * 50)
+    def __init__(self, stream):
+        self._stream = stream
+    
+    def write(self, text: str) -> int:
+        return (_section_output.get() or self._stream).write(text)
     
-    # 1. Command parser test
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+async def _run_section(buffer: io.StringIO, section: Awaitable):
+    """Run a test section with its prints captured in buffer
+    
+    Tasks and asyncio.to_thread workers inherit the context variable, so
+    concurrent sections do not mix their output.
+    """
+    _section_output.set(buffer)
+    await section
+
+
+def _test_parser_section():
+    """Command parser test section (LLM only, no PV access)"""
     print("\n1️⃣ Command Parser Test")
     print("-" * 30)
+    _test_parser_components()
+
+
+def _test_parser_components():
+    """Run the command parser and semantic cache tests"""
     test_command_parser()
     
+    print("\nSemantic cache lookups:")
+    test_semantic_cache()
+
+
+async def _test_engine_components():
+    """Run the execution engine and cancellation tests"""
+    await test_execution_engine()
+    
+    print("\nCancellation during each step:")
+    await test_execution_cancellation()
+
+
+async def _test_epics_components():
+    """Run the EPICS controller and execution engine tests in order
+    
+    Both tests read and write the same KSTAR PVs, so they are not run
+    concurrently with each other.
+    """
     # 2. EPICS controller test
     print("\n2️⃣ EPICS Controller Test")
     print("-" * 30)
-    test_epics_controller()
+    await asyncio.to_thread(test_epics_controller)
     
     # 3. Execution engine test
     print("\n3️⃣ Execution Engine Test")
     print("-" * 30)
-    await test_execution_engine()
+    await _test_engine_components()
+
+
+async def test_full_system():
+    """Test the complete KSTAR MCP PoC v2 system
+    
+    This function runs comprehensive tests on all major components
+    to ensure the system is working correctly. The command parser test
+    runs in a worker thread alongside the EPICS tests; each section's
+    output is buffered and printed in order once both have finished.
+    """
+    print("🧪 KSTAR MCP PoC v2 Full System Test")
+    print("=" * 50)
+    
+    parser_output, epics_output = io.StringIO(), io.StringIO()
+    stdout = sys.stdout
+    sys.stdout = _SectionStdout(stdout)
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(_run_section(parser_output, asyncio.to_thread(_test_parser_section)))
+            tg.create_task(_run_section(epics_output, _test_epics_components()))
+    finally:
+        sys.stdout = stdout
+        # Printed even if a section failed, so its partial output is not lost
+        print(parser_output.getvalue(), end="")
+        print(epics_output.getvalue(), end="")
     
     print("\n✅ All tests completed!")
 
@@ -66,8 +138,8 @@ def test_individual_components():
     print("🔧 Individual Component Test")
     print("=" * 30)
     
-    # Test command parser only
-    parser = CommandParser()
+    # Test command parser only (shared process-wide parser and its caches)
+    parser = get_parser()
     test_commands = [
         "Raise plasma temperature to 10 keV for 5 seconds",
         "Set temperature to 12 keV",
@@ -101,11 +173,11 @@ def main():
     args = parser.parse_args()
     
     if args.component == "parser":
-        test_command_parser()
+        _test_parser_components()
     elif args.component == "epics":
         test_epics_controller()
     elif args.component == "engine":
-        asyncio.run(test_execution_engine())
+        asyncio.run(_test_engine_components())
     elif args.component == "all":
         asyncio.run(test_full_system())
     